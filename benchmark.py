@@ -0,0 +1,226 @@
+"""Benchmark suite for Pomodoro Miner (headless, SDL dummy drivers).
+
+Measures mission update throughput at increasing entity counts, per-scene
+draw cost and Game startup time, and writes the results as JSON.
+
+    python benchmark.py -o bench.json
+    python benchmark.py --baseline bench.json   # exit 1 on regression
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+# Must be set before pygame / main are imported
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ["POMI_SAVE_DIR"] = tempfile.mkdtemp(prefix="pomi-bench-")
+
+import pygame  # noqa: E402
+import main  # noqa: E402
+
+FRAGMENT_COUNTS = (0, 100, 1000, 5000)
+PROJECTILE_COUNTS = (0, 8, 32)
+MENU_TASKS = 1000
+DEFAULT_THRESHOLD = 0.15  # 15% slower than baseline counts as a regression
+
+
+def _timeit(fn, iterations, batch=1, warmup=3):
+    """Run ``fn`` and return per-call timings in milliseconds.
+
+    Each sample times ``batch`` consecutive calls, which smooths out timer
+    resolution for sub-millisecond work.
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        for _ in range(batch):
+            fn()
+        samples.append((time.perf_counter() - t0) * 1000 / batch)
+    return samples
+
+
+def _summary(samples, **extra):
+    samples = sorted(samples)
+    result = {
+        "median_ms": round(statistics.median(samples), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "min_ms": round(samples[0], 4),
+        "n": len(samples),
+    }
+    result.update(extra)
+    return result
+
+
+def _new_game():
+    game = main.Game()
+    game.scene = game.menu
+    return game
+
+
+def _fill_pools(sim, fragments, projectiles):
+    """Put ``fragments`` settled on the orbit ring and ``projectiles`` in flight."""
+    for i in range(fragments):
+        a = 2 * math.pi * i / max(1, fragments)
+        sim.fragments.spawn(sim.cx + main.ORBIT_RADIUS * math.cos(a),
+                            sim.cy + main.ORBIT_RADIUS * math.sin(a))
+    for i in range(projectiles):
+        sim.projectiles.fire(sim.cx - main.ORBIT_RADIUS + i, sim.cy, sim.cx, sim.cy)
+
+
+def bench_mission_update(game, iterations):
+    """One MissionScene.update (one fixed tick) per call, at several entity counts."""
+    results = {}
+    for frags in FRAGMENT_COUNTS:
+        for projs in PROJECTILE_COUNTS:
+            clock = [0.0]
+            game.now = lambda: clock[0]
+            scene = main.MissionScene(game, main.Task("bench"), seed=1)
+            scene.sim.shoot_timer = float("inf")  # keep the workload fixed
+
+            def tick():
+                # Keep the pools at the requested size between ticks
+                missing_f = frags - len(scene.sim.fragments)
+                missing_p = projs - len(scene.sim.projectiles)
+                if missing_f > 0 or missing_p > 0:
+                    _fill_pools(scene.sim, max(0, missing_f), max(0, missing_p))
+                clock[0] += main.SIM_DT
+                scene.update(main.SIM_DT)
+
+            samples = _timeit(tick, iterations // 5, batch=10)
+            results[f"mission_update[f={frags},p={projs}]"] = _summary(
+                samples, fragments=frags, projectiles=projs)
+    del game.now
+    return results
+
+
+def bench_draw(game, iterations):
+    """Cost of one scene.draw into the screen surface for each scene."""
+    screen = game.screen
+    results = {}
+
+    game.tasks.clear()
+    for i in range(MENU_TASKS):
+        task = main.Task(f"Task {i:04d}")
+        task.pomodoros = i % 17
+        game.tasks.append(task)
+    scenes = {
+        f"draw_menu[tasks={MENU_TASKS}]": game.menu,
+        "draw_talents": main.TalentScene(game),
+        "draw_settings": main.SettingsScene(game),
+        "draw_stats": main.StatsScene(game),
+    }
+    mission = main.MissionScene(game, game.tasks[0], seed=1)
+    _fill_pools(mission.sim, 1000, 8)
+    scenes["draw_mission[f=1000,p=8]"] = mission
+    fade = main.FadeTransition(game, game.menu, main.TalentScene(game))
+    fade.timer = fade.duration * 0.25
+    scenes["draw_fade_transition"] = fade
+
+    for name, scene in scenes.items():
+        def draw(scene=scene):
+            screen.fill(main.BG_COLOR)
+            scene.draw(screen)
+        results[name] = _summary(_timeit(draw, iterations))
+    game.tasks.clear()
+    return results
+
+
+def bench_startup(repeats):
+    """Wall time of Game.__init__ (fonts, audio, save load, scenes)."""
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        game = main.Game()
+        samples.append((time.perf_counter() - t0) * 1000)
+        game.store.close()
+        game.assets.shutdown()
+    return {"startup": _summary(samples)}
+
+
+def run(quick=False):
+    iterations = 60 if quick else 300
+    results = {}
+    results.update(bench_startup(3 if quick else 10))
+    game = _new_game()
+    results.update(bench_mission_update(game, iterations))
+    results.update(bench_draw(game, iterations // 2))
+    game.store.close()
+    game.assets.shutdown()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold, metric="min_ms"):
+    """Print a per-benchmark comparison; return the names that regressed.
+
+    Compares ``min_ms`` by default: the fastest sample is the least
+    sensitive to scheduler noise on shared CI machines.
+    """
+    regressions = []
+    base = baseline.get("results", {})
+    print(f"{'benchmark':40s} {'base ms':>10s} {'now ms':>10s} {'change':>8s}")
+    for name, res in current["results"].items():
+        if name not in base:
+            print(f"{name:40s} {'-':>10s} {res[metric]:10.4f}      new")
+            continue
+        old, new = base[name][metric], res[metric]
+        change = (new - old) / old if old else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:40s} {old:10.4f} {new:10.4f} {change:+8.1%}{flag}")
+    return regressions
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="write results JSON to this file")
+    parser.add_argument("--baseline", help="compare against a previous results JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown that counts as a regression")
+    parser.add_argument("--metric", default="min_ms",
+                        choices=("min_ms", "median_ms", "mean_ms", "p95_ms"),
+                        help="statistic compared against the baseline")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations")
+    args = parser.parse_args(argv)
+
+    current = run(quick=args.quick)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold, args.metric)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed by more than "
+                  f"{args.threshold:.0%}")
+            return 1
+    elif not args.output:
+        json.dump(current, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
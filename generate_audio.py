@@ -1,73 +1,254 @@
-"""Generate placeholder SFX for Pomodoro Miner. Run once, then delete."""
+"""Generate procedural SFX and ambient loops for Pomodoro Miner.
 
+Each sound is a recipe (render function + parameters) in SOUNDS. Buffers
+are rendered whole with C-level ``map`` pipelines over ``array`` (no
+per-sample Python code) and written with a single ``writeframes``. Output
+is cached by a hash of the recipe, so re-running only renders sounds whose
+recipe or render code changed:
+
+    python generate_audio.py            # render new / changed sounds
+    python generate_audio.py --force    # render everything
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
 import math
-import struct
-import wave
 import os
 import random
+import sys
+import wave
+from array import array
+from itertools import repeat
+from operator import add, mul
 
 AUDIO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "audio")
+MANIFEST = ".audio_manifest.json"  # filename -> recipe hash, inside AUDIO_DIR
 SAMPLE_RATE = 44100
+TWO_PI = 2 * math.pi
+PITCH_SPREAD = 0.08  # runtime SFX variants span +-8% pitch
+
+
+# ---------------------------------------------------------------------------
+# Buffer primitives (whole-buffer, float samples in array('d'))
+# ---------------------------------------------------------------------------
+def n_samples(duration, sample_rate=SAMPLE_RATE):
+    return int(sample_rate * duration)
+
+
+def sine(freq, n, amp=1.0, sample_rate=SAMPLE_RATE):
+    """amp * sin(2*pi*freq*t) for n samples."""
+    w = TWO_PI * freq / sample_rate
+    wave_ = map(math.sin, map(mul, range(n), repeat(w)))
+    if amp == 1.0:
+        return array("d", wave_)
+    return array("d", map(mul, wave_, repeat(amp)))
+
+
+def sweep(f0, f1, n, amp=1.0, sample_rate=SAMPLE_RATE):
+    """Sine whose frequency slides linearly from f0 to f1 Hz over n samples."""
+    a = TWO_PI * f0 / sample_rate
+    b = TWO_PI * (f1 - f0) / (2 * n * sample_rate)
+    phase = map(add, map(mul, range(n), repeat(a)),
+                map(mul, map(mul, range(n), range(n)), repeat(b)))
+    return array("d", map(mul, map(math.sin, phase), repeat(amp)))
+
+
+def exp_decay(n, rate, sample_rate=SAMPLE_RATE):
+    """exp(-rate * t) envelope."""
+    return array("d", map(math.exp, map(mul, range(n), repeat(-rate / sample_rate))))
+
 
+def fade_edges(n, fade_len):
+    """Linear fade-in over the first and fade-out over the last fade_len samples."""
+    step = 1.0 / fade_len
+    env = array("d", map(mul, range(fade_len), repeat(step)))
+    env.extend(repeat(1.0, n - 2 * fade_len + 1))
+    env.extend(map(mul, range(fade_len - 1, 0, -1), repeat(step)))
+    return env
 
-def write_wav(filename, samples, sample_rate=SAMPLE_RATE):
+
+def noise(n, amp, seed):
+    """Seeded uniform white noise in [-amp, amp)."""
+    raw = array("h", random.Random(seed).randbytes(2 * n))
+    return array("d", map(mul, raw, repeat(amp / 32768)))
+
+
+def mix(*buffers):
+    """Sample-wise sum of equal-length buffers."""
+    if len(buffers) == 1:
+        return array("d", buffers[0])
+    return array("d", map(sum, zip(*buffers)))
+
+
+def multiply(a, b):
+    """Sample-wise product (apply an envelope)."""
+    return array("d", map(mul, a, b))
+
+
+def pcm16(samples, channels=1):
+    """Clamp to [-1, 1] and convert to native-endian 16-bit PCM, copied to ``channels``."""
+    clamped = map(min, repeat(1.0), map(max, repeat(-1.0), samples))
+    pcm = array("h", map(int, map(mul, clamped, repeat(32767))))
+    if channels > 1:
+        mono, pcm = pcm, array("h", bytes(2 * len(pcm) * channels))
+        for c in range(channels):
+            pcm[c::channels] = mono
+    return pcm
+
+
+def to_pcm16(samples):
+    """Little-endian 16-bit mono PCM bytes, as stored in WAV files."""
+    pcm = pcm16(samples)
+    if sys.byteorder == "big":
+        pcm.byteswap()
+    return pcm.tobytes()
+
+
+def write_wav(path, samples, sample_rate=SAMPLE_RATE):
     """Write mono 16-bit WAV from float samples (-1.0 to 1.0)."""
-    path = os.path.join(AUDIO_DIR, filename)
     with wave.open(path, "w") as f:
         f.setnchannels(1)
         f.setsampwidth(2)
         f.setframerate(sample_rate)
-        for s in samples:
-            s = max(-1.0, min(1.0, s))
-            f.writeframes(struct.pack("<h", int(s * 32767)))
-    print(f"  Created {filename} ({len(samples)} samples, {len(samples)/sample_rate:.2f}s)")
+        f.writeframes(to_pcm16(samples))
 
 
-def gen_ui_click():
+# ---------------------------------------------------------------------------
+# Sounds
+# ---------------------------------------------------------------------------
+def gen_ui_click(freq=800, duration=0.08, decay=60, gain=0.4):
     """Soft tonal click - short sine burst with fast decay."""
-    duration = 0.08
-    freq = 800
-    n = int(SAMPLE_RATE * duration)
-    samples = []
-    for i in range(n):
-        t = i / SAMPLE_RATE
-        env = math.exp(-t * 60)  # fast exponential decay
-        s = math.sin(2 * math.pi * freq * t) * env * 0.4
-        samples.append(s)
-    write_wav("ui_click.wav", samples)
-
-
-def gen_ambient_loop():
-    """Spacey ambient drone - layered low sines with slow modulation. ~10s loop."""
-    duration = 10.0
-    n = int(SAMPLE_RATE * duration)
-    # Base frequencies for a spacey chord (low, ethereal)
-    freqs = [55, 82.5, 110, 165]  # A1, E2, A2, E3
-    samples = []
-    for i in range(n):
-        t = i / SAMPLE_RATE
-        s = 0.0
-        for j, freq in enumerate(freqs):
-            # Slow amplitude modulation per voice
-            mod = 0.5 + 0.5 * math.sin(2 * math.pi * (0.05 + j * 0.03) * t)
-            s += math.sin(2 * math.pi * freq * t) * mod * 0.12
-        # Add subtle filtered noise texture
-        if i > 0:
-            noise = (random.random() * 2 - 1) * 0.015
-            s += noise
-        # Fade in/out for seamless loop
-        fade_len = int(SAMPLE_RATE * 0.5)
-        if i < fade_len:
-            s *= i / fade_len
-        elif i > n - fade_len:
-            s *= (n - i) / fade_len
-        samples.append(s)
-    write_wav("ambient_menu.wav", samples)
+    n = n_samples(duration)
+    return multiply(sine(freq, n, gain), exp_decay(n, decay))
+
+
+# Runtime SFX: rendered in-process by the game (see render_bank), never written
+# to disk. Each takes pitch / seed for variations and the mixer sample rate.
+def gen_ship_shoot(pitch=1.0, seed=0, sample_rate=SAMPLE_RATE,
+                   f0=1400, f1=350, duration=0.1, decay=25, gain=0.22):
+    """Laser zap - descending sine sweep."""
+    n = n_samples(duration, sample_rate)
+    return multiply(sweep(f0 * pitch, f1 * pitch, n, gain, sample_rate),
+                    exp_decay(n, decay, sample_rate))
+
+
+def gen_asteroid_hit(pitch=1.0, seed=0, sample_rate=SAMPLE_RATE,
+                     thump=90, duration=0.08, decay=45, gain=0.3):
+    """Percussive impact - noise burst over a low thump."""
+    n = n_samples(duration, sample_rate)
+    body = mix(noise(n, gain * 0.6, seed), sine(thump * pitch, n, gain, sample_rate))
+    return multiply(body, exp_decay(n, decay, sample_rate))
+
+
+def gen_fragment_collect(pitch=1.0, seed=0, sample_rate=SAMPLE_RATE,
+                         freq=1800, duration=0.12, decay=35, gain=0.18):
+    """Bright tink - high sine plus a fifth, quick decay."""
+    n = n_samples(duration, sample_rate)
+    tone = mix(sine(freq * pitch, n, gain, sample_rate),
+               sine(freq * 1.5 * pitch, n, gain * 0.4, sample_rate))
+    return multiply(tone, exp_decay(n, decay, sample_rate))
+
+
+def gen_ambient_loop(duration=10.0, freqs=(55, 82.5, 110, 165), gain=0.12,
+                     noise_amp=0.015, fade=0.5, seed=1):
+    """Spacey ambient drone - layered low sines with slow modulation."""
+    n = n_samples(duration)
+    voices = []
+    for j, freq in enumerate(freqs):
+        # Slow amplitude modulation per voice: 0.5 + 0.5 * sin(...)
+        mod = array("d", map(add, repeat(0.5), sine(0.05 + j * 0.03, n, 0.5)))
+        voices.append(multiply(sine(freq, n, gain), mod))
+    # Subtle noise texture, then fade in/out for a seamless loop
+    drone = mix(*voices, noise(n, noise_amp, seed))
+    return multiply(drone, fade_edges(n, n_samples(fade)))
+
+
+# filename -> (render function, parameters)
+SOUNDS = {
+    "ui_click.wav": (gen_ui_click, {}),
+    "ambient_menu.wav": (gen_ambient_loop, {}),
+}
+
+# sound name -> (render function, parameters), rendered at runtime
+RUNTIME_SFX = {
+    "ship_shoot": (gen_ship_shoot, {}),
+    "asteroid_hit": (gen_asteroid_hit, {}),
+    "fragment_collect": (gen_fragment_collect, {}),
+}
+
+
+def variant_pitches(count):
+    """``count`` pitch multipliers spread evenly over +-PITCH_SPREAD."""
+    if count <= 1:
+        return [1.0]
+    return [1.0 + PITCH_SPREAD * (2 * i / (count - 1) - 1) for i in range(count)]
+
+
+def render_bank(sample_rate=SAMPLE_RATE, channels=1, variants=4):
+    """{name: [pcm bytes, ...]}: every RUNTIME_SFX recipe in ``variants`` pitch variations."""
+    bank = {}
+    for name, (fn, params) in RUNTIME_SFX.items():
+        bank[name] = [
+            pcm16(fn(pitch=pitch, seed=i, sample_rate=sample_rate, **params),
+                  channels).tobytes()
+            for i, pitch in enumerate(variant_pitches(variants))]
+    return bank
+
+
+# Shared render code: part of every recipe's hash
+PRIMITIVES = (n_samples, sine, sweep, exp_decay, fade_edges, noise, mix, multiply,
+              pcm16, to_pcm16, write_wav)
+
+
+def _source(fn):
+    try:
+        return inspect.getsource(fn)
+    except OSError:
+        return fn.__qualname__
+
+
+def recipe_hash(fn, params, sample_rate=SAMPLE_RATE):
+    """Content address of a sound: render code + primitives + parameters + rate."""
+    blob = json.dumps({"source": _source(fn),
+                       "primitives": [_source(p) for p in PRIMITIVES],
+                       "params": params, "rate": sample_rate}, sort_keys=True)
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+def _load_manifest(audio_dir):
+    try:
+        with open(os.path.join(audio_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def generate(audio_dir=AUDIO_DIR, force=False):
+    """Render every sound whose recipe changed (or all with force)."""
+    os.makedirs(audio_dir, exist_ok=True)
+    manifest = _load_manifest(audio_dir)
+    for filename, (fn, params) in SOUNDS.items():
+        key = recipe_hash(fn, params)
+        path = os.path.join(audio_dir, filename)
+        if not force and manifest.get(filename) == key and os.path.exists(path):
+            print(f"  Cached  {filename}")
+            continue
+        samples = fn(**params)
+        write_wav(path, samples)
+        manifest[filename] = key
+        print(f"  Created {filename} ({len(samples)} samples, "
+              f"{len(samples) / SAMPLE_RATE:.2f}s)")
+    with open(os.path.join(audio_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
 
 
 if __name__ == "__main__":
-    os.makedirs(AUDIO_DIR, exist_ok=True)
+    parser = argparse.ArgumentParser(description="Generate Pomodoro Miner audio.")
+    parser.add_argument("--force", action="store_true",
+                        help="re-render sounds even if their recipe is unchanged")
+    args = parser.parse_args()
     print("Generating audio files...")
-    gen_ui_click()
-    gen_ambient_loop()
+    generate(force=args.force)
     print("Done!")
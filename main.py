@@ -1,16 +1,47 @@
 """Pomodoro Miner - Idle/Pomodoro hybrid game with Pygame."""
 
 import asyncio
+import bisect
+import csv
+import datetime
+import hashlib
+import io
 import math
 import os
 import random
+import struct
+import sys
+import time
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 import pygame
 
+try:
+    import sqlite3
+except ImportError:  # some web runtimes ship without it
+    sqlite3 = None
+
+try:
+    import mmap
+except ImportError:
+    mmap = None
+
+try:
+    import generate_audio  # procedural SFX recipes (runtime sound bank)
+except ImportError:
+    generate_audio = None
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
 WIDTH, HEIGHT = 900, 600
 FPS = 60
+# Adaptive frame pacing (see Game._target_fps)
+IDLE_FPS = 15        # static scene with no recent input
+UNFOCUSED_FPS = 5    # window lost focus
+HIDDEN_FPS = 2       # window minimized / hidden
+IDLE_AFTER = 1.0     # seconds without input before a static scene idles
 BG_COLOR = (0, 0, 0)
 
 # Font paths (relative to this file)
@@ -42,73 +73,334 @@ MAGNET_RADIUS = 60
 MAGNET_STRENGTH = 300
 ORBIT_SETTLE_STRENGTH = 40  # how strongly fragments are pulled to orbit radius
 
+TEXT_CACHE_SIZE = 256  # max cached text surfaces (LRU)
+BANNER_H = 36  # break banner height at the bottom of menu scenes
+TASK_BLOCK_SIZE = 256  # tasks per block in TaskList
+ROW_CACHE_SIZE = 64    # cached task row surfaces (LRU)
+SCROLL_STEP = 22       # pixels per mouse wheel notch
+SCROLL_EASE = 18.0     # smooth scroll speed (fraction of distance per second)
+TASK_SORT_MODES = ("added", "pomodoros", "recent")
+ASSET_WORKERS = 4  # background decoding threads
+SFX_VARIANTS = 4   # pitch/noise variants rendered per gameplay sound
+# Reserved mixer channels per sound category (see VoicePool)
+VOICE_CHANNELS = {"ui": 4, "gameplay": 8}
+SFX_RATE_LIMIT = 0.05  # seconds; repeats of one sound inside this window are dropped
+# Gameplay voice priorities: a new sound may steal a voice of equal or lower priority
+SFX_PRIORITY = {"ship_shoot": 0, "asteroid_hit": 1, "fragment_collect": 2}
+# Ambient playlists: assets/audio/ambient_<kind>*.wav|ogg, streamed (never decoded whole)
+AMBIENT_KINDS = ("menu", "mission", "break")
+AMBIENT_FALLBACK = {"break": "menu"}  # kind to use when a playlist is empty
+
 
 # ---------------------------------------------------------------------------
-# Audio
+# Assets
 # ---------------------------------------------------------------------------
 _AUDIO_DIR = os.path.join(_BASE_DIR, "assets", "audio")
+_IMAGE_DIR = os.path.join(_BASE_DIR, "assets", "images")
+
+
+class AssetJob:
+    def __init__(self, future, loader, args, on_done):
+        self.future = future  # None when loading sequentially
+        self.loader = loader
+        self.args = args
+        self.on_done = on_done
+
+
+class AssetManager:
+    """Background asset loading on a thread pool; ``poll`` hands results to the main thread."""
+
+    def __init__(self, workers=ASSET_WORKERS):
+        self._pool = None
+        if sys.platform != "emscripten":
+            self._pool = ThreadPoolExecutor(workers, thread_name_prefix="assets")
+        self._pending: deque[AssetJob] = deque()
+        self.total = 0
+        self.done = 0
+
+    @property
+    def busy(self):
+        return self.done < self.total
+
+    @property
+    def progress(self):
+        """Fraction of submitted jobs delivered so far (1.0 when idle)."""
+        return self.done / self.total if self.total else 1.0
+
+    def submit(self, loader, *args, on_done=None):
+        """Queue ``loader(*args)``; ``on_done(result)`` runs later on the main thread."""
+        future = self._pool.submit(loader, *args) if self._pool else None
+        job = AssetJob(future, loader, args, on_done)
+        self._pending.append(job)
+        self.total += 1
+        return job
+
+    def poll(self):
+        """Deliver finished jobs. Call once per frame from the main loop."""
+        if not self._pending:
+            return
+        if self._pool is None:
+            self._finish(self._pending.popleft())
+            return
+        waiting = deque()
+        for job in self._pending:
+            if job.future.done():
+                self._finish(job)
+            else:
+                waiting.append(job)
+        self._pending = waiting
+
+    def wait(self, job):
+        """Deliver ``job`` now, blocking until it is loaded if needed."""
+        if job in self._pending:
+            self._pending.remove(job)
+            self._finish(job)
+
+    def _finish(self, job):
+        try:
+            result = job.future.result() if job.future else job.loader(*job.args)
+        except Exception:
+            result = None  # graceful: skip assets that fail to load
+        self.done += 1
+        if result is not None and job.on_done:
+            job.on_done(result)
+
+    def shutdown(self):
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+STORY_CACHE_DIR = "story_cache"  # under SAVE_DIR
+_RAW_HEADER = struct.Struct("<II")  # width, height of a cached RGBA image
+
+
+def fit_size(w, h, box_w=WIDTH, box_h=HEIGHT):
+    """Largest (w, h) with the same aspect ratio that fits inside the box."""
+    scale = min(box_w / w, box_h / h)
+    return int(w * scale), int(h * scale)
+
+
+def load_scaled_story(path, cache_dir):
+    """Screen-size story image via an on-disk raw RGBA cache (runs on an asset worker)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    cache_path = os.path.join(
+        cache_dir, f"{hashlib.sha1(data).hexdigest()}_{WIDTH}x{HEIGHT}.rgba")
+    try:
+        with open(cache_path, "rb") as f:
+            w, h = _RAW_HEADER.unpack(f.read(_RAW_HEADER.size))
+            if os.fstat(f.fileno()).st_size == _RAW_HEADER.size + w * h * 4:
+                if mmap is not None:
+                    buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    return buf, _RAW_HEADER.size, (w, h)
+                return f.read(), 0, (w, h)
+    except (OSError, ValueError, struct.error):
+        pass  # missing or unreadable: regenerate below
+
+    image = pygame.image.load(io.BytesIO(data), os.path.basename(path))
+    scaled = pygame.transform.smoothscale(image, fit_size(*image.get_size()))
+    del image, data
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = cache_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_RAW_HEADER.pack(*scaled.get_size()))
+            f.write(pygame.image.tobytes(scaled, "RGBA"))
+        os.replace(tmp, cache_path)  # never leave a half-written variant
+    except OSError:
+        pass  # read-only save dir: just scale again next time
+    return scaled
+
+
+class VoicePool:
+    """Reserved mixer channels for one sound category, with priority voice stealing."""
+
+    def __init__(self, first, count, rate_limit=0.0, clock=time.monotonic):
+        self.channels = [pygame.mixer.Channel(i) for i in range(first, first + count)]
+        self.volume = 1.0
+        self.rate_limit = rate_limit
+        self._clock = clock
+        self._started = [0.0] * count
+        self._priority = [0] * count
+        self._last: dict[str, float] = {}
+
+    def _pick(self, priority):
+        """Index of an idle channel, else of the voice to steal (or None)."""
+        victim = None
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i
+            if self._priority[i] > priority:
+                continue
+            if victim is None or (self._priority[i], self._started[i]) < (
+                    self._priority[victim], self._started[victim]):
+                victim = i
+        return victim
+
+    def play(self, sound, name, volume=None, priority=0, loops=0):
+        """Play ``sound`` on a pool channel; return the channel or None if dropped."""
+        now = self._clock()
+        if self.rate_limit and now - self._last.get(name, -self.rate_limit) < self.rate_limit:
+            return None
+        i = self._pick(priority)
+        if i is None:
+            return None
+        self._last[name] = now
+        self._started[i] = now
+        self._priority[i] = priority
+        channel = self.channels[i]
+        channel.set_volume(self.volume if volume is None else volume)
+        channel.play(sound, loops=loops)
+        return channel
+
+    def set_volume(self, vol):
+        """Set the category volume, including voices already playing."""
+        self.volume = vol
+        for channel in self.channels:
+            if channel.get_busy():
+                channel.set_volume(vol)
+
+    def stop(self):
+        for channel in self.channels:
+            channel.stop()
 
 
 class AudioManager:
     """Handles SFX and ambient audio with independent volume controls."""
 
-    def __init__(self):
+    def __init__(self, assets=None):
         pygame.mixer.init()
+        self._assets = assets
         self._sounds: dict[str, pygame.mixer.Sound] = {}
-        self._ambient_channel: pygame.mixer.Channel | None = None
-        self._current_ambient: str | None = None
+        self._playlists: dict[str, list[str]] = {kind: [] for kind in AMBIENT_KINDS}
+        self._ambient_kind: str | None = None  # playlist currently selected
+        self._track = -1                        # index into that playlist
+        self._pending_in = 0.0  # fade-in (s) for the next track, after a fade-out
+        self._fade_wait = 0.0   # seconds left on the current fade-out
+        self._bank: dict[str, list[pygame.mixer.Sound]] = {}
+        self.pools: dict[str, VoicePool] = {}
+        self._init_pools()
         self._load_all()
+        self._init_bank()
+
+    def _init_pools(self):
+        # All pool channels are reserved, so Sound.play never picks them
+        # and each category only ever competes with itself
+        total = sum(VOICE_CHANNELS.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), total))
+        pygame.mixer.set_reserved(total)
+        first = 0
+        for category, count in VOICE_CHANNELS.items():
+            self.pools[category] = VoicePool(first, count, SFX_RATE_LIMIT)
+            first += count
 
     def _load_all(self):
         if not os.path.isdir(_AUDIO_DIR):
             return
-        for fname in os.listdir(_AUDIO_DIR):
+        for fname in sorted(os.listdir(_AUDIO_DIR)):
             if fname.endswith((".wav", ".ogg")):
                 name = os.path.splitext(fname)[0]
+                path = os.path.join(_AUDIO_DIR, fname)
+                if name.startswith("ambient_"):
+                    for kind in AMBIENT_KINDS:
+                        if name.startswith("ambient_" + kind):
+                            self._playlists[kind].append(path)
+                    continue  # streamed, see set_ambient
+                if self._assets:
+                    self._assets.submit(pygame.mixer.Sound, path,
+                                        on_done=lambda snd, n=name: self._add(n, snd))
+                    continue
                 try:
-                    self._sounds[name] = pygame.mixer.Sound(
-                        os.path.join(_AUDIO_DIR, fname))
+                    self._sounds[name] = pygame.mixer.Sound(path)
                 except Exception:
                     pass  # graceful: skip files that fail to load
 
+    def _add(self, name, sound):
+        self._sounds[name] = sound
+
+    def _init_bank(self):
+        init = pygame.mixer.get_init()
+        if generate_audio is None or init is None:
+            return
+        freq, fmt, channels = init
+        if fmt != -16:
+            return  # the bank is rendered as signed 16-bit PCM
+        args = (generate_audio.render_bank, freq, channels, SFX_VARIANTS)
+        if self._assets:
+            self._assets.submit(*args, on_done=self._set_bank)
+        else:
+            self._set_bank(args[0](*args[1:]))
+
+    def _set_bank(self, pcm):
+        self._bank = {name: [pygame.mixer.Sound(buffer=buf) for buf in bufs]
+                      for name, bufs in pcm.items()}
+
+    def play_sfx(self, name, volume=None):
+        """Play a random variant of a bank sound on the gameplay pool."""
+        variants = self._bank.get(name)
+        if variants:
+            self.pools["gameplay"].play(random.choice(variants), name, volume,
+                                        SFX_PRIORITY.get(name, 0))
+
     def play(self, name, volume=None):
-        """Play a one-shot SFX. Volume from game.sfx_volume if not given."""
+        """Play a one-shot UI sound. Volume from the ui pool if not given."""
         sound = self._sounds.get(name)
         if sound:
-            if volume is not None:
-                sound.set_volume(volume)
-            sound.play()
-
-    def play_ambient(self, name, volume=0.5):
-        """Start looping an ambient sound. Stops previous ambient if any."""
-        if name == self._current_ambient:
-            # Already playing, just update volume
-            if self._ambient_channel:
-                self._ambient_channel.set_volume(volume)
+            self.pools["ui"].play(sound, name, volume)
+
+    def set_ambient(self, kind, volume=0.5, fade=0.0):
+        """Crossfade the ambient playlist to ``kind`` (None for silence) over ``fade`` seconds."""
+        if kind is not None and not self._playlists.get(kind):
+            kind = AMBIENT_FALLBACK.get(kind)
+            if not self._playlists.get(kind):
+                kind = None
+        pygame.mixer.music.set_volume(volume)
+        if kind == self._ambient_kind:
             return
-        self.stop_ambient()
-        sound = self._sounds.get(name)
-        if sound:
-            self._ambient_channel = sound.play(loops=-1)
-            if self._ambient_channel:
-                self._ambient_channel.set_volume(volume)
-            self._current_ambient = name
+        self._ambient_kind = kind
+        self._track = -1
+        half = fade / 2
+        self._fade_wait = self._pending_in = half
+        if half <= 0:
+            pygame.mixer.music.stop()
+            self._next_track()
+        elif pygame.mixer.music.get_busy():
+            pygame.mixer.music.fadeout(int(half * 1000))
+
+    def _next_track(self):
+        playlist = self._playlists.get(self._ambient_kind)
+        if not playlist:
+            return
+        self._track = (self._track + 1) % len(playlist)
+        try:
+            pygame.mixer.music.load(playlist[self._track])
+            # A single-track playlist loops in the mixer, gaplessly
+            pygame.mixer.music.play(loops=-1 if len(playlist) == 1 else 0,
+                                    fade_ms=int(self._pending_in * 1000))
+        except pygame.error:
+            playlist.pop(self._track)  # unplayable: drop it from the rotation
+            self._track -= 1
+        self._pending_in = 0.0
+
+    def update(self, dt):
+        """Advance fades and the ambient playlist. Call once per frame."""
+        if self._fade_wait > 0:
+            self._fade_wait -= dt
+            if self._fade_wait <= 0:
+                self._next_track()
+        elif self._ambient_kind and not pygame.mixer.music.get_busy():
+            self._next_track()  # track ended (or never started): next one
 
     def stop_ambient(self):
-        if self._ambient_channel:
-            self._ambient_channel.stop()
-            self._ambient_channel = None
-            self._current_ambient = None
+        self.set_ambient(None)
 
     def set_sfx_volume(self, vol):
-        """Update volume for all non-ambient sounds."""
-        for name, sound in self._sounds.items():
-            if name != self._current_ambient:
-                sound.set_volume(vol)
+        """Volume for UI and gameplay sounds (their channels, not the Sounds)."""
+        for pool in self.pools.values():
+            pool.set_volume(vol)
 
     def set_ambient_volume(self, vol):
-        if self._ambient_channel:
-            self._ambient_channel.set_volume(vol)
+        pygame.mixer.music.set_volume(vol)
 
 
 # ---------------------------------------------------------------------------
@@ -118,16 +410,72 @@ def clamp(v, lo, hi):
     return max(lo, min(hi, v))
 
 
-def generate_asteroid_points(cx, cy, base_r, n=14):
+def _merge_overlapping(rects):
+    """Union rects that overlap (transitively); disjoint ones stay separate."""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        i = rect.collidelist(merged)
+        while i >= 0:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+def generate_asteroid_points(cx, cy, base_r, n=14, rng=random):
     """Create an irregular polygon (circle with noise)."""
     pts = []
     for i in range(n):
         angle = 2 * math.pi * i / n
-        r = base_r + random.uniform(-base_r * 0.25, base_r * 0.25)
+        r = base_r + rng.uniform(-base_r * 0.25, base_r * 0.25)
         pts.append((cx + r * math.cos(angle), cy + r * math.sin(angle)))
     return pts
 
 
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, color).
+    Returned surfaces are shared: don't modify them."""
+
+    def __init__(self, maxsize=TEXT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._surfs: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surf = self._surfs.get(key)
+        if surf is not None:
+            self._surfs.move_to_end(key)
+            return surf
+        surf = font.render(text, True, color)
+        self._surfs[key] = surf
+        if len(self._surfs) > self.maxsize:
+            self._surfs.popitem(last=False)  # evict least recently used
+        return surf
+
+    def clear(self):
+        self._surfs.clear()
+
+
+class OverlayCache:
+    """Full-screen tint overlays, allocated once per color and shared.
+    The alpha is set on every call: blit the result right away."""
+
+    def __init__(self):
+        self._overlays: dict[tuple, pygame.Surface] = {}
+
+    def get(self, alpha, color=BG_COLOR):
+        surf = self._overlays.get(color)
+        if surf is None:
+            surf = pygame.Surface((WIDTH, HEIGHT))
+            if pygame.display.get_surface() is not None:
+                surf = surf.convert()
+            surf.fill(color)
+            self._overlays[color] = surf
+        surf.set_alpha(alpha)
+        return surf
+
+
 # ---------------------------------------------------------------------------
 # Talent System
 # ---------------------------------------------------------------------------
@@ -186,8 +534,451 @@ class TalentTree:
 # ---------------------------------------------------------------------------
 class Task:
     def __init__(self, name: str):
+        self.id: int | None = None  # SaveStore row id
         self.name = name
         self.pomodoros = 0
+        self.active = 0.0  # last time created or mined (epoch seconds)
+
+
+class TaskList:
+    """Task sequence stored as a list of blocks (unrolled list)."""
+
+    def __init__(self, items=(), block_size=TASK_BLOCK_SIZE):
+        self.block_size = block_size
+        self._blocks: list[list[Task]] = [[]]
+        self._home: dict[Task, list[Task]] = {}  # block holding each task
+        self._starts = None    # list index of each block's first task, when current
+        self._block_at = None  # id(block) -> block index, when current
+        self._len = 0
+        for item in items:
+            self.append(item)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for block in self._blocks:
+            yield from block
+
+    def _layout(self):
+        """Block start offsets, rebuilt lazily after tasks were added or removed."""
+        if self._starts is None:
+            starts, total = [], 0
+            for block in self._blocks:
+                starts.append(total)
+                total += len(block)
+            self._starts = starts
+        return self._starts
+
+    def _locate(self, idx):
+        """Return (block index, offset in block) for a list index."""
+        if idx < 0:
+            idx += self._len
+        if not 0 <= idx < self._len:
+            raise IndexError("TaskList index out of range")
+        starts = self._layout()
+        b = bisect.bisect_right(starts, idx) - 1
+        return b, idx - starts[b]
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(self._len)
+            if step != 1:
+                return list(self)[idx]
+            out = []
+            if start >= stop:
+                return out
+            b, off = self._locate(start)
+            need = stop - start
+            while need > 0:
+                chunk = self._blocks[b][off:off + need]
+                out.extend(chunk)
+                need -= len(chunk)
+                b, off = b + 1, 0
+            return out
+        b, off = self._locate(idx)
+        return self._blocks[b][off]
+
+    def append(self, item):
+        block = self._blocks[-1]
+        block.append(item)
+        self._home[item] = block
+        self._len += 1
+        self._starts = None
+        self._split(len(self._blocks) - 1)
+
+    def insert(self, idx, item):
+        if idx < 0:
+            idx = max(0, idx + self._len)
+        if idx >= self._len:
+            self.append(item)
+            return
+        b, off = self._locate(idx)
+        block = self._blocks[b]
+        block.insert(off, item)
+        self._home[item] = block
+        self._len += 1
+        self._starts = None
+        self._split(b)
+
+    def pop(self, idx=-1):
+        b, off = self._locate(idx)
+        return self._take(b, off)
+
+    def remove(self, item):
+        """Remove ``item`` (by identity); only the block holding it is searched."""
+        block = self._home.get(item)
+        if block is None:
+            raise ValueError("task not in TaskList")
+        if self._block_at is None:
+            self._block_at = {id(block): b for b, block in enumerate(self._blocks)}
+        off = next(off for off, other in enumerate(block) if other is item)
+        self._take(self._block_at[id(block)], off)
+
+    def _take(self, b, off):
+        block = self._blocks[b]
+        item = block.pop(off)
+        del self._home[item]
+        self._len -= 1
+        self._starts = None
+        if not block and len(self._blocks) > 1:
+            del self._blocks[b]
+            self._block_at = None
+        return item
+
+    def clear(self):
+        self._blocks = [[]]
+        self._home.clear()
+        self._starts = self._block_at = None
+        self._len = 0
+
+    def _split(self, b):
+        block = self._blocks[b]
+        if len(block) > 2 * self.block_size:
+            half = len(block) // 2
+            tail = block[half:]
+            del block[half:]
+            self._blocks.insert(b + 1, tail)
+            self._block_at = None
+            for item in tail:
+                self._home[item] = tail
+
+
+class TaskIndex:
+    """Incremental search index (trigrams, word prefixes) and sort orders over the tasks."""
+
+    def __init__(self):
+        self._names: dict[Task, str] = {}         # lowercased names
+        self._seq: dict[Task, int] = {}           # insertion order
+        self._grams: dict[str, set[Task]] = {}
+        self._prefixes: dict[str, set[Task]] = {}
+        self._orders = {"pomodoros": [], "recent": []}
+        self._keys: dict[Task, dict] = {}         # current sort entry per order
+        self._next_seq = 0
+        self._last = ("", None)  # (query, result) for incremental narrowing
+        self.version = 0         # bumped on every change
+
+    def __len__(self):
+        return len(self._names)
+
+    @staticmethod
+    def _trigrams(text):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    @staticmethod
+    def _word_prefixes(text):
+        return {word[:n] for word in text.split() for n in (1, 2)}
+
+    def _sort_entries(self, task):
+        seq = self._seq[task]
+        return {"pomodoros": (-task.pomodoros, -seq, task),
+                "recent": (-task.active, -seq, task)}
+
+    def add(self, task):
+        name = task.name.lower()
+        self._names[task] = name
+        self._seq[task] = self._next_seq
+        self._next_seq += 1
+        for gram in self._trigrams(name):
+            self._grams.setdefault(gram, set()).add(task)
+        for prefix in self._word_prefixes(name):
+            self._prefixes.setdefault(prefix, set()).add(task)
+        entries = self._keys[task] = self._sort_entries(task)
+        for mode, entry in entries.items():
+            bisect.insort(self._orders[mode], entry)
+        self._changed()
+
+    def remove(self, task):
+        name = self._names.pop(task)
+        for table, keys in ((self._grams, self._trigrams(name)),
+                            (self._prefixes, self._word_prefixes(name))):
+            for key in keys:
+                bucket = table[key]
+                bucket.discard(task)
+                if not bucket:
+                    del table[key]
+        for mode, entry in self._keys.pop(task).items():
+            order = self._orders[mode]
+            del order[bisect.bisect_left(order, entry)]
+        del self._seq[task]
+        self._changed()
+
+    def update(self, task):
+        """Re-position ``task`` after its pomodoro count or activity changed."""
+        old = self._keys[task]
+        new = self._keys[task] = self._sort_entries(task)
+        for mode, entry in new.items():
+            if entry != old[mode]:
+                order = self._orders[mode]
+                del order[bisect.bisect_left(order, old[mode])]
+                bisect.insort(order, entry)
+        self._changed()
+
+    def _changed(self):
+        self.version += 1
+        self._last = ("", None)
+
+    def search(self, query):
+        """Set of tasks matching ``query`` (case-insensitive)."""
+        q = query.strip().lower()
+        last_q, last_result = self._last
+        if last_result is not None and len(last_q) >= 3 and q.startswith(last_q):
+            # Narrowing the previous query: filter its (small) result
+            names = self._names
+            result = {t for t in last_result if q in names[t]}
+        elif len(q) < 3:
+            result = set(self._prefixes.get(q, ()))
+        else:
+            buckets = [self._grams.get(g) for g in self._trigrams(q)]
+            if not all(buckets):
+                result = set()
+            else:
+                buckets.sort(key=len)
+                result = buckets[0].intersection(*buckets[1:])
+                # Trigrams can match out of order; confirm the substring
+                names = self._names
+                result = {t for t in result if q in names[t]}
+        self._last = (q, result)
+        return result
+
+    def ordered(self, mode, subset=None):
+        """Tasks in ``mode`` order, optionally restricted to ``subset``."""
+        if mode == "added":
+            if subset is None:
+                return list(self._seq)  # dicts keep insertion order
+            return sorted(subset, key=self._seq.__getitem__)
+        order = self._orders[mode]
+        if subset is None:
+            return [entry[-1] for entry in order]
+        if len(subset) * 8 < len(order):
+            keys = self._keys
+            return sorted(subset, key=lambda t: keys[t][mode])
+        return [entry[-1] for entry in order if entry[-1] in subset]
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+SAVE_DIR = os.environ.get("POMI_SAVE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".pomodoro_miner")
+SAVE_FILE = "save.db"
+SETTING_KEYS = ("sfx_volume", "ambient_volume", "pomodoro_minutes", "break_minutes")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    pomodoros INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    active REAL                    -- last mission on this task (or created)
+);
+CREATE TABLE IF NOT EXISTS talents (
+    id TEXT PRIMARY KEY,
+    level INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    day INTEGER NOT NULL,          -- local date ordinal ((day - 1) // 7 = Monday-first week)
+    task_id INTEGER,
+    task_name TEXT NOT NULL,
+    duration REAL NOT NULL,        -- seconds actually mined
+    collected INTEGER NOT NULL,
+    earned INTEGER NOT NULL,       -- fragments kept (30% on abort)
+    aborted INTEGER NOT NULL,
+    build TEXT NOT NULL,           -- talent levels in TALENT_ORDER
+    seed INTEGER
+);
+CREATE INDEX IF NOT EXISTS history_day ON history (aborted, day, task_id, task_name);
+CREATE INDEX IF NOT EXISTS history_task ON history (task_id, day);
+CREATE INDEX IF NOT EXISTS history_build
+    ON history (aborted, build, collected, duration);
+"""
+
+
+def _day_number(ts):
+    """Local calendar day of a timestamp as a date ordinal (Mondays are 7k+1)."""
+    return datetime.date.fromtimestamp(ts).toordinal()
+
+
+def talent_build_key(levels):
+    """Compact talent snapshot, e.g. '2,0,5,1,0,0' in TALENT_ORDER."""
+    return ",".join(str(levels.get(tid, 0)) for tid in TALENT_ORDER)
+
+
+class SaveStore:
+    """SQLite-backed save data with one small transaction per change."""
+
+    def __init__(self, path=None):
+        if path is None:
+            path = os.path.join(SAVE_DIR, SAVE_FILE)
+        self.path = path
+        self.db = self._connect(path)
+
+    @staticmethod
+    def _connect(path):
+        if sqlite3 is None:
+            return None
+        try:
+            if path != ":memory:":
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            db = sqlite3.connect(path)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(_SCHEMA)
+            SaveStore._migrate(db)
+        except (OSError, sqlite3.Error):
+            db = sqlite3.connect(":memory:")  # graceful: play without saving
+            db.executescript(_SCHEMA)
+        return db
+
+    @staticmethod
+    def _migrate(db):
+        """Bring saves from older versions up to the current schema."""
+        columns = {row[1] for row in db.execute("PRAGMA table_info(tasks)")}
+        if "active" not in columns:
+            with db:
+                db.execute("ALTER TABLE tasks ADD COLUMN active REAL")
+                db.execute("UPDATE tasks SET active = created")
+
+    def _write(self, sql, *rows):
+        if self.db is None:
+            return
+        with self.db:  # one atomic transaction per delta
+            for params in rows:
+                self.db.execute(sql, params)
+
+    # -- load --
+    def load(self):
+        """Return the saved state as plain data (empty dicts on first run)."""
+        state = {"tasks": [], "talents": {}, "meta": {}}
+        if self.db is None:
+            return state
+        state["tasks"] = self.db.execute(
+            "SELECT id, name, pomodoros, COALESCE(active, created) FROM tasks"
+            " ORDER BY id").fetchall()
+        state["talents"] = dict(self.db.execute("SELECT id, level FROM talents"))
+        state["meta"] = dict(self.db.execute("SELECT key, value FROM meta"))
+        return state
+
+    # -- deltas --
+    def add_task(self, task):
+        task.active = time.time()
+        if self.db is None:
+            return
+        with self.db:
+            cur = self.db.execute(
+                "INSERT INTO tasks (name, pomodoros, created, active) VALUES (?, ?, ?, ?)",
+                (task.name, task.pomodoros, task.active, task.active))
+        task.id = cur.lastrowid
+
+    def delete_task(self, task):
+        self._write("DELETE FROM tasks WHERE id = ?", (task.id,))
+
+    def set_meta(self, **values):
+        self._write("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    *values.items())
+
+    def mission_complete(self, task, fragments, total_pomodoros):
+        """Persist a completed mission: task count plus global totals."""
+        if self.db is None:
+            return
+        with self.db:
+            self.db.execute("UPDATE tasks SET pomodoros = ? WHERE id = ?",
+                            (task.pomodoros, task.id))
+            self.db.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (("fragments", fragments), ("total_pomodoros", total_pomodoros)))
+
+    def talent_upgraded(self, talent_id, level, fragments):
+        if self.db is None:
+            return
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO talents (id, level) VALUES (?, ?)",
+                            (talent_id, level))
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                            ("fragments", fragments))
+
+    # -- mission history --
+    def record_mission(self, task, duration, collected, earned, aborted,
+                       talent_levels, seed=None):
+        """Append one completed or aborted mission to the history log."""
+        now = time.time()
+        task.active = now
+        if self.db is None:
+            return
+        with self.db:
+            self.db.execute(
+                "INSERT INTO history (ts, day, task_id, task_name, duration, collected,"
+                " earned, aborted, build, seed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (now, _day_number(now), task.id, task.name, duration, collected,
+                 earned, int(aborted), talent_build_key(talent_levels), seed))
+            self.db.execute("UPDATE tasks SET active = ? WHERE id = ?", (now, task.id))
+
+    def _query(self, sql, params=()):
+        if self.db is None:
+            return []
+        return self.db.execute(sql, params).fetchall()
+
+    def history_summary(self):
+        """(completed, aborted, fragments earned, minutes focused) over all time."""
+        rows = self._query(
+            "SELECT COALESCE(SUM(aborted = 0), 0), COALESCE(SUM(aborted), 0),"
+            " COALESCE(SUM(earned), 0), COALESCE(SUM(duration), 0) / 60.0 FROM history")
+        return rows[0] if rows else (0, 0, 0, 0.0)
+
+    def pomodoros_per_day(self, days=7):
+        """[(day number, completed pomodoros)] for the last ``days`` days."""
+        first = _day_number(time.time()) - days + 1
+        counts = dict(self._query(
+            "SELECT day, COUNT(*) FROM history WHERE day >= ? AND aborted = 0"
+            " GROUP BY day", (first,)))
+        return [(d, counts.get(d, 0)) for d in range(first, first + days)]
+
+    def pomodoros_per_task_per_week(self, weeks=1):
+        """[(week number, task name, pomodoros)] for the last ``weeks`` weeks."""
+        # Mondays are 7k+1, so (day - 1) // 7 starts each week on Monday
+        first_week = (_day_number(time.time()) - 1) // 7 - weeks + 1
+        return self._query(
+            "SELECT (day - 1) / 7 AS week, task_name, COUNT(*) AS n FROM history"
+            " WHERE day >= ? AND aborted = 0"
+            " GROUP BY week, task_id ORDER BY week DESC, n DESC", (first_week * 7 + 1,))
+
+    def fragments_per_minute_by_build(self, limit=5):
+        """[(build key, fragments per minute, missions)] best builds first."""
+        return self._query(
+            "SELECT build, SUM(collected) * 60.0 / SUM(duration) AS rate, COUNT(*)"
+            " FROM history WHERE aborted = 0 AND duration > 0"
+            " GROUP BY build ORDER BY rate DESC LIMIT ?", (limit,))
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
 
 
 # ---------------------------------------------------------------------------
@@ -253,87 +1044,545 @@ class Ship:
             return True
         return False
 
-    def draw(self, surf):
-        f = self.facing
-        cos_t, sin_t = math.cos(f), math.sin(f)
-        s = self.size
-        tip = (self.x + cos_t * s, self.y + sin_t * s)
-        left = (self.x + math.cos(f + 2.4) * s * 0.7,
-                self.y + math.sin(f + 2.4) * s * 0.7)
-        right = (self.x + math.cos(f - 2.4) * s * 0.7,
-                 self.y + math.sin(f - 2.4) * s * 0.7)
-        pygame.draw.polygon(surf, CYAN, [tip, left, right])
+    def enqueue(self, queue, sprites):
+        sprite, half = sprites.ship(self.facing)
+        queue.add(LAYER_SHIP, sprite, (int(self.x) - half, int(self.y) - half))
+
+
+PROJECTILE_CAPACITY = 64
+ASTEROID_HIT_RADIUS = 35
+
+
+class ProjectilePool:
+    """Fixed-capacity projectile store with free-list slot reuse."""
 
+    def __init__(self, capacity=PROJECTILE_CAPACITY):
+        self.capacity = capacity
+        self.x = array("d", bytes(8 * capacity))
+        self.y = array("d", bytes(8 * capacity))
+        self.vx = array("d", bytes(8 * capacity))
+        self.vy = array("d", bytes(8 * capacity))
+        self.live = []  # slots in flight, so update never walks empty ones
+        self._free = list(range(capacity - 1, -1, -1))
 
-class Projectile:
-    def __init__(self, x, y, tx, ty):
+    def __len__(self):
+        return len(self.live)
+
+    def fire(self, x, y, tx, ty):
+        """Launch a projectile from (x, y) toward (tx, ty). False if full."""
+        if not self._free:
+            return False
+        i = self._free.pop()
         dx, dy = tx - x, ty - y
         dist = math.hypot(dx, dy) or 1
-        self.x, self.y = x, y
-        self.vx = dx / dist * PROJECTILE_SPEED
-        self.vy = dy / dist * PROJECTILE_SPEED
-        self.alive = True
+        self.x[i], self.y[i] = x, y
+        self.vx[i] = dx / dist * PROJECTILE_SPEED
+        self.vy[i] = dy / dist * PROJECTILE_SPEED
+        self.live.append(i)
+        return True
 
-    def update(self, dt):
-        self.x += self.vx * dt
-        self.y += self.vy * dt
+    def update(self, dt, cx, cy, hit_radius=ASTEROID_HIT_RADIUS):
+        """Move every live projectile. Returns how many hit the asteroid."""
+        if not self.live:
+            return 0
+        xs, ys, vxs, vys = self.x, self.y, self.vx, self.vy
+        hit_r2 = hit_radius * hit_radius
+        hits = 0
+        flying = []
+        for i in self.live:
+            x = xs[i] + vxs[i] * dt
+            y = ys[i] + vys[i] * dt
+            xs[i], ys[i] = x, y
+            dx, dy = x - cx, y - cy
+            if dx * dx + dy * dy < hit_r2:
+                hits += 1
+                self._free.append(i)
+            elif not (0 <= x < WIDTH and 0 <= y < HEIGHT):
+                self._free.append(i)  # missed and left the screen
+            else:
+                flying.append(i)
+        self.live = flying
+        return hits
 
-    def draw(self, surf):
-        pygame.draw.circle(surf, YELLOW, (int(self.x), int(self.y)), 3)
+    def enqueue(self, queue, sprites):
+        if not self.live:
+            return
+        sprite, half = sprites.projectile
+        xs, ys = self.x, self.y
+        queue.extend(LAYER_PROJECTILES,
+                     [(sprite, (int(xs[i]) - half, int(ys[i]) - half))
+                      for i in self.live],
+                     source=sprite)
+
+
+FRAGMENT_COLORS = (ORANGE, YELLOW, GREEN, CYAN)
+FRAGMENT_MAX_SIZE = 6  # fragments are 3..FRAGMENT_MAX_SIZE px squares
+COLLECT_RADIUS = 15
+BEAM_COLOR = (0, 110, 130)  # ship -> nearest fragment line
+
+
+class FragmentPool:
+    """Struct-of-arrays store for every live fragment in a mission."""
+
+    def __init__(self, cx, cy, rng=random):
+        self.center = complex(cx, cy)
+        self.rng = rng
+        # Positions and velocities as x + yj: one complex op does both axes
+        self.pos = []
+        self.vel = []
+        self.color = array("B")  # index into FRAGMENT_COLORS
+        self.size = array("B")
+        self.nearest = -1  # slot closest to the ship within magnet reach, or -1
+
+    def __len__(self):
+        return len(self.pos)
+
+    def clear(self):
+        self.pos.clear()
+        self.vel.clear()
+        del self.color[:], self.size[:]
+        self.nearest = -1
+
+    def spawn(self, x, y):
+        """Launch a fragment radially outward from the asteroid center."""
+        rng = self.rng
+        angle = (math.atan2(y - self.center.imag, x - self.center.real)
+                 + rng.uniform(-0.3, 0.3))
+        speed = rng.uniform(FRAGMENT_SPEED * 0.5, FRAGMENT_SPEED)
+        self.color.append(rng.randrange(len(FRAGMENT_COLORS)))
+        self.size.append(rng.randint(3, FRAGMENT_MAX_SIZE))
+        self.pos.append(complex(x, y))
+        self.vel.append(complex(math.cos(angle) * speed, math.sin(angle) * speed))
+
+    def _remove(self, i):
+        """Swap-compact: move the last live fragment into slot ``i``."""
+        for column in (self.pos, self.vel, self.color, self.size):
+            last = column.pop()
+            if i < len(column):
+                column[i] = last
+
+    def update(self, dt, ship_x, ship_y,
+               magnet_radius=MAGNET_RADIUS, magnet_strength=MAGNET_STRENGTH):
+        """Advance every fragment one step. Returns the number collected."""
+        positions, velocities = self.pos, self.vel
+        center, ship = self.center, complex(ship_x, ship_y)
+        settle_k = ORBIT_SETTLE_STRENGTH * dt / ORBIT_RADIUS
+        pull = magnet_strength * dt
+        collected = 0
+        nearest, nearest_dist = -1, magnet_radius
+
+        i, n = 0, len(positions)
+        while i < n:
+            pos = positions[i]
+            # Decelerate
+            vel = velocities[i] * FRAGMENT_DECEL
+
+            # Settle toward orbit radius
+            offset = pos - center
+            dist_c = abs(offset)
+            if dist_c > 0:
+                vel += offset * ((ORBIT_RADIUS - dist_c) * settle_k / dist_c)
+
+            # Magnet toward ship if close (distance before moving)
+            to_ship = ship - pos
+            dist = abs(to_ship)
+            if dist < COLLECT_RADIUS:
+                collected += 1
+                self._remove(i)
+                n -= 1
+                continue  # slot i now holds the former last fragment
+            if dist < magnet_radius:
+                vel += to_ship * (pull / dist)
+                if dist < nearest_dist:
+                    nearest, nearest_dist = i, dist
+
+            positions[i] = pos + vel * dt
+            velocities[i] = vel
+            i += 1
+        # Slots below i never move again this pass, so nearest stays valid
+        self.nearest = nearest
+        return collected
+
+    def enqueue(self, queue, sprites):
+        if not self.pos:
+            return
+        table = sprites.fragments  # [color][size] -> surface
+        queue.extend(LAYER_FRAGMENTS,
+                     [(table[c][s], (int(p.real) - (s >> 1), int(p.imag) - (s >> 1)))
+                      for p, c, s in zip(self.pos, self.color, self.size)])
+
+
+# ---------------------------------------------------------------------------
+# Sprites
+# ---------------------------------------------------------------------------
+SHIP_ANGLES = 64          # rotation steps baked for the ship sprite
+ORBIT_RING_COLOR = (30, 30, 40)
+
+# RenderQueue layers, drawn bottom to top
+LAYER_BACKGROUND = 0
+LAYER_SHIP = 1
+LAYER_PROJECTILES = 2
+LAYER_FRAGMENTS = 3
+LAYER_HUD = 4
+
+
+class RenderQueue:
+    """Collects one frame's blits and submits them in a single ``Surface.blits``."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def add(self, layer, surface, pos):
+        self._chunks.append((layer, id(surface), [(surface, pos)]))
+
+    def extend(self, layer, items, source=None):
+        """Queue a list of (surface, pos) pairs; ``source`` if they share one."""
+        if items:
+            self._chunks.append((layer, id(source) if source is not None else 0, items))
 
+    def flush(self, surf):
+        chunks = self._chunks
+        if not chunks:
+            return
+        chunks.sort(key=lambda c: (c[0], c[1]))
+        if len(chunks) == 1:
+            seq = chunks[0][2]
+        else:
+            seq = []
+            for chunk in chunks:
+                seq.extend(chunk[2])
+        surf.blits(seq, doreturn=False)
+        chunks.clear()
+
+
+class SpriteCache:
+    """Pre-rendered mission sprites, built once per Game."""
+
+    def __init__(self):
+        self._ships = [self._bake_ship(2 * math.pi * i / SHIP_ANGLES)
+                       for i in range(SHIP_ANGLES)]
+        self.fragments = [
+            [self._solid(color, size) if size else None
+             for size in range(FRAGMENT_MAX_SIZE + 1)]
+            for color in FRAGMENT_COLORS]
+        dot = pygame.Surface((7, 7), pygame.SRCALPHA)
+        pygame.draw.circle(dot, YELLOW, (3, 3), 3)
+        self.projectile = (self._prepare(dot, alpha=True), 3)
+
+    @staticmethod
+    def _prepare(surf, alpha=False):
+        """Convert to the display format when there is a display."""
+        if pygame.display.get_surface() is None:
+            return surf
+        return surf.convert_alpha() if alpha else surf.convert()
+
+    def _solid(self, color, size):
+        surf = pygame.Surface((size, size))
+        surf.fill(color)
+        return self._prepare(surf)
+
+    def _bake_ship(self, facing, size=12):
+        half = size + 1
+        surf = pygame.Surface((2 * half, 2 * half), pygame.SRCALPHA)
+        tip = (half + math.cos(facing) * size, half + math.sin(facing) * size)
+        left = (half + math.cos(facing + 2.4) * size * 0.7,
+                half + math.sin(facing + 2.4) * size * 0.7)
+        right = (half + math.cos(facing - 2.4) * size * 0.7,
+                 half + math.sin(facing - 2.4) * size * 0.7)
+        pygame.draw.polygon(surf, CYAN, [tip, left, right])
+        return self._prepare(surf, alpha=True), half
+
+    def ship(self, facing):
+        """(sprite, half size) for the ship rotation closest to ``facing``."""
+        step = round(facing * SHIP_ANGLES / (2 * math.pi)) % SHIP_ANGLES
+        return self._ships[step]
+
+    def mission_background(self, sim):
+        """Asteroid and orbit ring of ``sim`` baked into one opaque patch: (surface, topleft)."""
+        r = ORBIT_RADIUS + 1
+        left, top = sim.cx - r, sim.cy - r
+        patch = pygame.Surface((2 * r + 1, 2 * r + 1))
+        patch.fill(BG_COLOR)
+        pygame.draw.circle(patch, ORBIT_RING_COLOR, (r, r), ORBIT_RADIUS, 1)
+        pts = [(x - left, y - top) for x, y in sim.asteroid_pts]
+        pygame.draw.polygon(patch, ASTEROID_COLOR, pts)
+        pygame.draw.polygon(patch, GRAY, pts, 2)
+        return self._prepare(patch), (left, top)
+
+
+# ---------------------------------------------------------------------------
+# Mission simulation (headless)
+# ---------------------------------------------------------------------------
+SIM_DT = 1.0 / FPS  # fixed simulation timestep (seconds)
+MAX_CATCHUP_STEPS = 120  # sim ticks per frame when behind the wall clock
+MAX_SIM_BACKLOG = 5.0    # seconds of lag kept for catch-up; the rest is skipped
+FRAGMENT_SETTLE_TIME = 3.0  # mean seconds for a new fragment to reach the orbit
+LATENCY_MIN_SAMPLES = 30    # ticked fragments before latency is measured
+
+
+class MissionSim:
+    """Display-free mission logic, advanced in fixed ``SIM_DT`` ticks.
+    The same seed and talent levels reproduce the same mission."""
+
+    def __init__(self, talents, duration, seed=None):
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.duration = duration
+        self.remaining = duration  # seconds
+        self.collected = 0
+        self.shots = 0     # bullets fired
+        self.hits = 0      # bullets that hit the asteroid
+        self.spawned = 0   # fragments spawned
+        self.ticks = 0
+        # Little's law inputs for _collect_latency (ticked spans only)
+        self._tick_spawned = 0
+        self._live_frag_ticks = 0
+        # offline_yield state carried between skip calls
+        self._burst_carry = 0.0  # sampled bursts not yet whole
+        self._skipped_run = 0.0  # seconds skipped since the last tick
+        self.profiler = None  # FrameProfiler, set by MissionScene when enabled
+        self.complete = False
 
-class Fragment:
-    def __init__(self, x, y, cx, cy):
-        # Launch radially outward from asteroid center
-        angle = math.atan2(y - cy, x - cx) + random.uniform(-0.3, 0.3)
-        speed = random.uniform(FRAGMENT_SPEED * 0.5, FRAGMENT_SPEED)
-        self.x, self.y = x, y
+        cx, cy = WIDTH // 2, HEIGHT // 2 + 30
         self.cx, self.cy = cx, cy
-        self.vx = math.cos(angle) * speed
-        self.vy = math.sin(angle) * speed
-        self.alive = True
-        self.color = random.choice([ORANGE, YELLOW, GREEN, CYAN])
-        self.size = random.randint(3, 6)
-
-    def update(self, dt, ship, magnet_radius=MAGNET_RADIUS, magnet_strength=MAGNET_STRENGTH):
-        # Decelerate
-        self.vx *= FRAGMENT_DECEL
-        self.vy *= FRAGMENT_DECEL
-
-        # Settle toward orbit radius
-        dx_c = self.x - self.cx
-        dy_c = self.y - self.cy
-        dist_c = math.hypot(dx_c, dy_c)
-        if dist_c > 0:
-            current_dir_x = dx_c / dist_c
-            current_dir_y = dy_c / dist_c
-            error = ORBIT_RADIUS - dist_c
-            settle = ORBIT_SETTLE_STRENGTH * dt
-            self.vx += current_dir_x * error * settle / ORBIT_RADIUS
-            self.vy += current_dir_y * error * settle / ORBIT_RADIUS
-
-        # Magnet toward ship if close
-        dx, dy = ship.x - self.x, ship.y - self.y
-        dist = math.hypot(dx, dy)
-        if dist < magnet_radius and dist > 0:
-            pull = magnet_strength * dt
-            self.vx += dx / dist * pull
-            self.vy += dy / dist * pull
-
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-
-        # Collected?
-        if dist < 15:
-            self.alive = False
-            return True  # collected
-        return False
 
-    def draw(self, surf):
-        rect = pygame.Rect(int(self.x) - self.size // 2,
-                           int(self.y) - self.size // 2,
-                           self.size, self.size)
-        pygame.draw.rect(surf, self.color, rect)
+        # Apply talent multipliers
+        t = talents
+        eff_orbit_speed = ORBIT_SPEED * t.get_multiplier("orbit_speed")
+        self.eff_magnet_radius = MAGNET_RADIUS * t.get_multiplier("magnet_range")
+        self.eff_magnet_strength = MAGNET_STRENGTH * t.get_multiplier("frag_magnet_str")
+        self.eff_shoot_interval_mult = 1.0 / t.get_multiplier("fire_rate")  # lower = faster
+        self.double_frag_chance = t.get_chance("double_frag")
+        self.bullet_count = BASE_BULLET_COUNT + int(t.get_chance("bullet_count"))
+
+        self.ship = Ship(cx, cy, eff_orbit_speed)
+        self.asteroid_pts = generate_asteroid_points(cx, cy, 40, rng=self.rng)
+        self.projectiles = ProjectilePool()
+        self.fragments = FragmentPool(cx, cy, rng=self.rng)
+
+        self._next_shot_time()
+
+    def _next_shot_time(self):
+        lo, hi = SHOOT_INTERVAL_RANGE
+        self.shoot_timer = self.rng.uniform(lo, hi) * self.eff_shoot_interval_mult
+
+    def _fire_one_bullet(self):
+        """Fire a single bullet toward the asteroid with slight spread."""
+        base_angle = math.atan2(self.cy - self.ship.y, self.cx - self.ship.x)
+        spread = self.rng.uniform(-BULLET_SPREAD, BULLET_SPREAD)
+        a = base_angle + spread
+        dist = math.hypot(self.cx - self.ship.x, self.cy - self.ship.y)
+        tx = self.ship.x + math.cos(a) * dist
+        ty = self.ship.y + math.sin(a) * dist
+        if self.projectiles.fire(self.ship.x, self.ship.y, tx, ty):
+            self.shots += 1
+
+    def _spawn_fragment(self):
+        """Spawn one fragment from a random point on the asteroid surface."""
+        spawn_angle = self.rng.uniform(0, 2 * math.pi)
+        sx = self.cx + math.cos(spawn_angle) * ASTEROID_HIT_RADIUS
+        sy = self.cy + math.sin(spawn_angle) * ASTEROID_HIT_RADIUS
+        self.fragments.spawn(sx, sy)
+        self.spawned += 1
+        self._tick_spawned += 1
+
+    def step(self, dt=SIM_DT):
+        """Advance one tick. Sets ``complete`` when the timer runs out."""
+        if self.complete:
+            return
+        self.ticks += 1
+        self._skipped_run = 0.0
+
+        # Timer
+        self.remaining -= dt
+        if self.remaining <= 0:
+            self.remaining = 0
+            self.complete = True
+            return
+
+        # Ship
+        self.ship.update(dt)
+
+        # Shooting state machine
+        self.shoot_timer -= dt
+        if self.shoot_timer <= 0 and self.ship.state == Ship.STATE_ORBITING:
+            self.ship.start_shooting(self.bullet_count)
+            self._next_shot_time()
+
+        # Fire bullets one by one during burst
+        if self.ship.should_fire():
+            self._fire_one_bullet()
+
+        prof = self.profiler
+        if prof:
+            t0 = time.perf_counter()
+
+        # Projectiles: spawn fragment(s) from the asteroid surface per hit
+        hits = self.projectiles.update(dt, self.cx, self.cy)
+        self.hits += hits
+        for _ in range(hits):
+            self._spawn_fragment()
+            if self.rng.random() < self.double_frag_chance:
+                self._spawn_fragment()
+
+        if prof:
+            t1 = time.perf_counter()
+            prof.add("projectiles", t1 - t0)
+
+        # Fragments
+        self.collected += self.fragments.update(
+            dt, self.ship.x, self.ship.y,
+            self.eff_magnet_radius, self.eff_magnet_strength)
+        self._live_frag_ticks += len(self.fragments)
+
+        if prof:
+            prof.add("fragments", time.perf_counter() - t1)
+
+    # -- offline resolver --
+    def _shot_cycle(self):
+        """Mean and variance (seconds) of the time between burst starts."""
+        lo, hi = SHOOT_INTERVAL_RANGE
+        a, b = lo * self.eff_shoot_interval_mult, hi * self.eff_shoot_interval_mult
+        burst = (self.bullet_count - 1) * math.ceil(BURST_INTERVAL / SIM_DT) * SIM_DT
+        if burst <= a:
+            mean, m2 = (a + b) / 2, (a * a + a * b + b * b) / 3
+        elif burst >= b:
+            mean, m2 = burst, burst * burst
+        else:
+            w = b - a
+            mean = (burst * (burst - a) + (b * b - burst * burst) / 2) / w
+            m2 = (burst * burst * (burst - a) + (b ** 3 - burst ** 3) / 3) / w
+        var = max(0.0, m2 - mean * mean)
+        # Timers resolve on tick boundaries: on average half a tick late
+        return mean + SIM_DT / 2, var
+
+    def _collect_latency(self):
+        """Mean seconds from a fragment spawning to the ship sweeping it up."""
+        if self._tick_spawned >= LATENCY_MIN_SAMPLES:
+            return self._live_frag_ticks * SIM_DT / self._tick_spawned
+        cycle, _ = self._shot_cycle()
+        burst = (self.bullet_count - 1) * math.ceil(BURST_INTERVAL / SIM_DT) * SIM_DT
+        duty = min(1.0, burst / cycle)
+        speed = self.ship.base_orbit_speed * (1 - duty * (1 - SHOOTING_SPEED_MULT))
+        return FRAGMENT_SETTLE_TIME + math.pi / speed
+
+    def offline_yield(self, seconds):
+        """Sample (bullets, fragments) the full sim would produce in ``seconds``."""
+        if seconds <= 0:
+            return 0, 0
+        cycle, cycle_var = self._shot_cycle()
+        rng = self.rng
+        x = self._burst_carry + rng.gauss(seconds / cycle,
+                                          math.sqrt(seconds * cycle_var / cycle ** 3))
+        bursts = max(0, int(x))
+        self._burst_carry = x - bursts
+        bullets = bursts * self.bullet_count
+        # Every bullet hits: 1 fragment plus Bernoulli(double_frag_chance)
+        p = self.double_frag_chance
+        frags = bullets + (sum(rng.random() < p for _ in range(bullets)) if p else 0)
+        return bullets, frags
+
+    def skip(self, seconds):
+        """Advance by ``seconds`` without per-tick physics, using ``offline_yield``."""
+        if self.complete or seconds <= 0:
+            return
+        seconds = min(seconds, self.remaining)
+        start = self.duration - self.remaining
+        self.remaining -= seconds
+        if self.remaining <= 0:
+            self.remaining = 0
+            self.complete = True
+
+        latency = self._collect_latency()
+        bullets, frags = self.offline_yield(seconds)
+        self.shots += bullets
+        self.hits += bullets
+        self.spawned += frags
+        # Fragments spawned within ``latency`` of the mission end are never
+        # swept up; that cutoff is absolute, so it holds for every chunk
+        reachable = (self.duration - latency - start) / seconds
+        if reachable < 1:
+            frags = int(frags * max(0.0, reachable) + self.rng.random())
+        self.collected += frags
+        self._skipped_run += seconds
+        if self._skipped_run >= latency:
+            # The ship has swept the whole ring since: on-screen fragments too
+            self.collected += len(self.fragments)
+            self.fragments.clear()
+
+        ship = self.ship
+        ship.state = Ship.STATE_ORBITING
+        ship.bullets_remaining = 0
+        ship.angle = (ship.angle + ship.base_orbit_speed * seconds) % (2 * math.pi)
+        ship.x = ship.cx + ORBIT_RADIUS * math.cos(ship.angle)
+        ship.y = ship.cy + ORBIT_RADIUS * math.sin(ship.angle)
+        self.shoot_timer -= seconds
+        if self.shoot_timer <= 0:
+            self._next_shot_time()
+
+    def run(self, seconds, dt=SIM_DT):
+        """Fast-forward up to ``seconds`` of mission time (stops on complete)."""
+        for _ in range(int(round(seconds / dt))):
+            if self.complete:
+                break
+            self.step(dt)
+
+
+def simulate_mission(levels=None, minutes=25, dt=SIM_DT, seed=None, offline=False):
+    """Run a full mission headless (``offline``: resolved analytically) and return its result."""
+    talents = TalentTree()
+    if levels:
+        talents.levels.update(levels)
+    sim = MissionSim(talents, minutes * 60, seed=seed)
+    if offline:
+        sim.skip(sim.remaining)
+    while not sim.complete:
+        sim.step(dt)
+    return {
+        "minutes": minutes,
+        "offline": offline,
+        "seed": sim.seed,
+        "levels": dict(talents.levels),
+        "collected": sim.collected,
+        "shots": sim.shots,
+        "spawned": sim.spawned,
+        "ticks": sim.ticks,
+    }
+
+
+def _simulate_cli(argv):
+    """``python main.py --simulate`` entry point: print one JSON result per run."""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(prog="main.py --simulate")
+    parser.add_argument("--minutes", type=float, default=25)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of the first run (run i uses seed + i)")
+    parser.add_argument("--offline", action="store_true",
+                        help="resolve analytically instead of tick by tick")
+    parser.add_argument("--talent", action="append", default=[], metavar="ID=LEVEL",
+                        help="talent level, e.g. --talent double_frag=5")
+    args = parser.parse_args(argv)
+
+    levels = {}
+    for item in args.talent:
+        tid, _, lvl = item.partition("=")
+        if tid not in TALENT_DEFS:
+            parser.error(f"unknown talent '{tid}'")
+        levels[tid] = clamp(int(lvl), 0, TALENT_DEFS[tid]["max"])
+
+    for i in range(args.runs):
+        seed = None if args.seed is None else args.seed + i
+        t0 = time.perf_counter()
+        result = simulate_mission(levels, args.minutes, seed=seed, offline=args.offline)
+        elapsed = time.perf_counter() - t0
+        result["wall_seconds"] = round(elapsed, 3)
+        result["ticks_per_second"] = int(result["ticks"] / elapsed) if elapsed else 0
+        print(json.dumps(result))
 
 
 # ---------------------------------------------------------------------------
@@ -374,6 +1623,10 @@ class IntroScene:
             self._line_starts.append(acc)
             acc += len(line)
 
+        # Private copy: cached text surfaces are shared and must not be faded
+        self._title_surf = game.text.render(game.font_title, "POMI Corp.", CYAN).copy()
+        self._typing = ("", None)  # (prefix, surface) of the line being typed
+
     def _skip(self):
         self.game.scene = FadeTransition(self.game, self, self.game.menu)
 
@@ -424,9 +1677,8 @@ class IntroScene:
         else:
             alpha = 255
 
-        title_surf = self.game.font_title.render("POMI Corp.", True, CYAN)
-        if alpha < 255:
-            title_surf.set_alpha(alpha)
+        title_surf = self._title_surf
+        title_surf.set_alpha(alpha if alpha < 255 else None)
         surf.blit(title_surf, (WIDTH // 2 - title_surf.get_width() // 2,
                                 HEIGHT // 3 - title_surf.get_height() // 2))
 
@@ -439,35 +1691,73 @@ class IntroScene:
                     break
                 visible = line[:remaining]
                 remaining -= len(line)
-                if visible:
-                    line_surf = self.game.font.render(visible, True, GRAY)
-                    surf.blit(line_surf, (WIDTH // 2 - line_surf.get_width() // 2, y))
+                if not visible:
+                    y += 28
+                    continue
+                if remaining >= 0:
+                    line_surf = self.game.text.render(self.game.font, line, GRAY)
+                else:
+                    # The line being typed changes every few frames: keep its
+                    # prefixes out of the shared TextCache
+                    if self._typing[0] != visible:
+                        self._typing = (visible, self.game.font.render(visible, True, GRAY))
+                    line_surf = self._typing[1]
+                surf.blit(line_surf, (WIDTH // 2 - line_surf.get_width() // 2, y))
                 y += 28
 
         # Skip hint
         if self.phase != "title_fade":
-            hint = self.game.font_small.render("Click o presione una tecla para continuar",
-                                                True, DARK_GRAY)
+            hint = self.game.text.render(self.game.font_small,
+                                         "Click o presione una tecla para continuar",
+                                         DARK_GRAY)
             surf.blit(hint, (WIDTH // 2 - hint.get_width() // 2, HEIGHT - 40))
 
+        # Background asset loading progress
+        assets = self.game.assets
+        if assets.busy:
+            bar = pygame.Rect(WIDTH // 2 - 100, HEIGHT - 16, 200, 4)
+            pygame.draw.rect(surf, DARK_GRAY, bar)
+            pygame.draw.rect(surf, CYAN, (bar.x, bar.y, int(bar.w * assets.progress), bar.h))
+
 
 class MenuScene:
+    static = True  # redrawn only when invalidated (see Game.invalidate)
+
     def __init__(self, game):
         self.game = game
         self.input_text = ""
         self.input_active = False
-        self.scroll_offset = 0
+        self.scroll_px = 0.0     # drawn scroll position (pixels)
+        self.scroll_target = 0   # where smooth scrolling is heading
+        self.search_mode = False  # input box filters the list instead of adding
+        self.sort_mode = TASK_SORT_MODES[0]
+        self._view = None         # tasks currently listed, rebuilt on change
+        self._view_key = None
         # Layout
         self.input_rect = pygame.Rect(50, 90, 500, 36)
         self.add_btn = pygame.Rect(560, 90, 80, 36)
+        self.find_btn = pygame.Rect(650, 90, 80, 36)
+        self.sort_btn = pygame.Rect(WIDTH - 270, 124, 220, 22)
         self.talent_btn = pygame.Rect(WIDTH - 160, 20, 140, 36)
         self.settings_btn = pygame.Rect(WIDTH - 310, 20, 140, 36)
+        self.stats_btn = pygame.Rect(WIDTH - 160, 90, 140, 36)
         self.list_top = 150
         self.row_h = 44
+        self.list_rect = pygame.Rect(50, self.list_top, WIDTH - 100,
+                                     self._visible_rows() * self.row_h)
+        # Pre-rendered rows: task -> ((name, pomodoros), surface)
+        self._rows: OrderedDict[Task, tuple] = OrderedDict()
 
     # -- events --
     def handle_event(self, ev):
-        if ev.type == pygame.MOUSEBUTTONDOWN:
+        if ev.type == pygame.MOUSEWHEEL:
+            # precise_y carries fractional trackpad scrolling (pygame >= 2.2)
+            dy = getattr(ev, "precise_y", ev.y)
+            self._scroll_to(self.scroll_target - dy * SCROLL_STEP)
+        elif ev.type == pygame.MOUSEBUTTONDOWN and ev.button in (4, 5):
+            return  # legacy wheel buttons; scrolling comes from MOUSEWHEEL
+        elif ev.type == pygame.MOUSEBUTTONDOWN:
+            self.game.invalidate()
             mx, my = ev.pos
             # Click input box
             self.input_active = self.input_rect.collidepoint(mx, my)
@@ -475,6 +1765,19 @@ class MenuScene:
             if self.add_btn.collidepoint(mx, my):
                 self.game.audio.play("ui_click", self.game.sfx_volume)
                 self._add_task()
+            # Search toggle
+            if self.find_btn.collidepoint(mx, my):
+                self.game.audio.play("ui_click", self.game.sfx_volume)
+                self.search_mode = not self.search_mode
+                self.input_active = self.search_mode
+                self.input_text = ""
+                self._scroll_to(0)
+            # Sort order
+            if self.sort_btn.collidepoint(mx, my):
+                self.game.audio.play("ui_click", self.game.sfx_volume)
+                i = TASK_SORT_MODES.index(self.sort_mode)
+                self.sort_mode = TASK_SORT_MODES[(i + 1) % len(TASK_SORT_MODES)]
+                self._scroll_to(0)
             # Talents button
             if self.talent_btn.collidepoint(mx, my):
                 self.game.audio.play("ui_click", self.game.sfx_volume)
@@ -485,143 +1788,231 @@ class MenuScene:
                 self.game.audio.play("ui_click", self.game.sfx_volume)
                 self.game.scene = SettingsScene(self.game)
                 return
+            # Stats button
+            if self.stats_btn.collidepoint(mx, my):
+                self.game.audio.play("ui_click", self.game.sfx_volume)
+                self.game.scene = StatsScene(self.game)
+                return
             # Task list buttons
             self._check_list_click(mx, my)
-            # Scroll
-            if ev.button == 4:
-                self.scroll_offset = max(0, self.scroll_offset - 1)
-            elif ev.button == 5:
-                max_scroll = max(0, len(self.game.tasks) - self._visible_rows())
-                self.scroll_offset = min(max_scroll, self.scroll_offset + 1)
 
         elif ev.type == pygame.KEYDOWN and self.input_active:
             if ev.key == pygame.K_RETURN:
-                self._add_task()
-            elif ev.key == pygame.K_BACKSPACE:
+                if not self.search_mode:
+                    self._add_task()
+                    self.game.invalidate()
+                return
+            # Searching re-filters the list on every keystroke
+            self.game.invalidate(None if self.search_mode else self.input_rect)
+            if ev.key == pygame.K_BACKSPACE:
                 self.input_text = self.input_text[:-1]
             else:
                 if ev.unicode and ev.unicode.isprintable() and len(self.input_text) < 40:
                     self.input_text += ev.unicode
+            if self.search_mode:
+                self._scroll_to(0)
+                self.scroll_px = 0.0
 
     def _add_task(self):
         name = self.input_text.strip()
         if name:
-            self.game.tasks.append(Task(name))
+            task = Task(name)
+            self.game.tasks.append(task)
+            self.game.store.add_task(task)
+            self.game.task_index.add(task)
             self.input_text = ""
 
+    def _delete_task(self, task, idx=None):
+        """Remove ``task``; ``idx`` is its position in Game.tasks when known."""
+        if idx is None:
+            self.game.tasks.remove(task)
+        else:
+            self.game.tasks.pop(idx)
+        self.game.task_index.remove(task)
+        self._rows.pop(task, None)
+        self.game.store.delete_task(task)
+
+    def _visible_tasks(self):
+        """Tasks listed right now: filtered by the search and in sort order."""
+        query = self.input_text.strip() if self.search_mode else ""
+        index = self.game.task_index
+        key = (query, self.sort_mode, index.version)
+        if key != self._view_key:
+            self._view_key = key
+            if not query and self.sort_mode == "added":
+                self._view = None
+            else:
+                subset = index.search(query) if query else None
+                self._view = index.ordered(self.sort_mode, subset)
+        return self.game.tasks if self._view is None else self._view
+
     def _visible_rows(self):
         return max(1, (HEIGHT - self.list_top - 20) // self.row_h)
 
+    def _max_scroll(self):
+        return max(0, len(self._visible_tasks()) * self.row_h - self.list_rect.height)
+
+    def _scroll_to(self, target):
+        self.scroll_target = clamp(round(target), 0, self._max_scroll())
+
+    # Row layout, relative to the row's top-left corner on the list
+    _START_X = WIDTH - 270
+    _DELETE_X = WIDTH - 180
+    _BTN_Y, _BTN_W, _BTN_H = 4, 80, 32
+
     def _check_list_click(self, mx, my):
-        vis = self._visible_rows()
-        for i in range(vis):
-            idx = i + self.scroll_offset
-            if idx >= len(self.game.tasks):
-                break
-            row_y = self.list_top + i * self.row_h
-            # Start button
-            start_r = pygame.Rect(WIDTH - 220, row_y + 4, 80, 32)
-            if start_r.collidepoint(mx, my):
-                self.game.audio.play("ui_click", self.game.sfx_volume)
-                self.game.start_mission(idx)
-                return
-            # Delete button
-            del_r = pygame.Rect(WIDTH - 130, row_y + 4, 80, 32)
-            if del_r.collidepoint(mx, my):
-                self.game.audio.play("ui_click", self.game.sfx_volume)
-                self.game.tasks.pop(idx)
-                self.scroll_offset = clamp(self.scroll_offset, 0,
-                                           max(0, len(self.game.tasks) - vis))
-                return
+        """Hit-test the list in O(1): the row comes straight from the y position."""
+        if not self.list_rect.collidepoint(mx, my):
+            return
+        y = my - self.list_top + int(self.scroll_px)
+        idx, row_y = divmod(y, self.row_h)
+        tasks = self._visible_tasks()
+        if idx >= len(tasks):
+            return
+        if not self._BTN_Y <= row_y < self._BTN_Y + self._BTN_H:
+            return
+        x = mx - self.list_rect.x
+        if self._START_X <= x < self._START_X + self._BTN_W:
+            self.game.audio.play("ui_click", self.game.sfx_volume)
+            self.game.start_mission(tasks[idx])
+        elif self._DELETE_X <= x < self._DELETE_X + self._BTN_W:
+            self.game.audio.play("ui_click", self.game.sfx_volume)
+            if tasks is self.game.tasks:
+                self._delete_task(tasks[idx], idx)
+            else:
+                self._delete_task(tasks[idx])
+            self._scroll_to(self.scroll_target)
+            self.scroll_px = min(self.scroll_px, self._max_scroll())
+
+    def _row_surface(self, task):
+        """Pre-rendered row for ``task``; rebuilt only when its name or count changes."""
+        key = (task.name, task.pomodoros)
+        cached = self._rows.get(task)
+        if cached is not None and cached[0] == key:
+            self._rows.move_to_end(task)
+            return cached[1]
+
+        font = self.game.font
+        text = self.game.text
+        row = pygame.Surface((self.list_rect.width, self.row_h))
+        row.fill(BG_COLOR)
+        # Separator line
+        pygame.draw.line(row, DARK_GRAY, (0, 0), (row.get_width(), 0))
+        row.blit(font.render(task.name, True, WHITE), (10, 10))
+        row.blit(font.render(str(task.pomodoros), True, YELLOW), (WIDTH - 410, 10))
+        for x, color, label in ((self._START_X, GREEN, "Start"),
+                                (self._DELETE_X, RED, "Delete")):
+            btn = pygame.Rect(x, self._BTN_Y, self._BTN_W, self._BTN_H)
+            pygame.draw.rect(row, color, btn, border_radius=4)
+            lbl = text.render(font, label, BG_COLOR)
+            row.blit(lbl, (btn.centerx - lbl.get_width() // 2,
+                           btn.centery - lbl.get_height() // 2))
+
+        self._rows[task] = (key, row)
+        if len(self._rows) > ROW_CACHE_SIZE:
+            self._rows.popitem(last=False)
+        return row
 
     # -- update / draw --
     def update(self, dt):
-        pass
+        # Ease towards the wheel target; only the list area needs redrawing
+        if self.scroll_px != self.scroll_target:
+            diff = self.scroll_target - self.scroll_px
+            step = diff * min(1.0, dt * SCROLL_EASE)
+            self.scroll_px = (float(self.scroll_target) if abs(diff) < 0.5
+                              else self.scroll_px + step)
+            self.game.invalidate(self.list_rect)
+            self.game.invalidate((0, HEIGHT - 30, WIDTH, 30))  # scroll hint
 
     def draw(self, surf):
         font = self.game.font
 
         # Title
-        title = self.game.font_title.render("POMODORO MINER", True, CYAN)
+        title = self.game.text.render(self.game.font_title, "POMODORO MINER", CYAN)
         surf.blit(title, (WIDTH // 2 - title.get_width() // 2, 16))
 
         # Fragment counter
-        frag_s = font.render(f"Fragments: {self.game.talents.fragments}", True, YELLOW)
+        frag_s = self.game.text.render(font, f"Fragments: {self.game.talents.fragments}",
+                                       YELLOW)
         surf.blit(frag_s, (20, 20))
 
         # Settings button
         pygame.draw.rect(surf, GRAY, self.settings_btn, border_radius=4)
-        sl = font.render("Settings", True, BG_COLOR)
+        sl = self.game.text.render(font, "Settings", BG_COLOR)
         surf.blit(sl, (self.settings_btn.centerx - sl.get_width() // 2,
                         self.settings_btn.centery - sl.get_height() // 2))
 
         # Talents button
         pygame.draw.rect(surf, ORANGE, self.talent_btn, border_radius=4)
-        tl = font.render("Talents", True, BG_COLOR)
+        tl = self.game.text.render(font, "Talents", BG_COLOR)
         surf.blit(tl, (self.talent_btn.centerx - tl.get_width() // 2,
                         self.talent_btn.centery - tl.get_height() // 2))
 
-        # Input box
+        # Stats button
+        pygame.draw.rect(surf, CYAN, self.stats_btn, border_radius=4)
+        stl = self.game.text.render(font, "Stats", BG_COLOR)
+        surf.blit(stl, (self.stats_btn.centerx - stl.get_width() // 2,
+                        self.stats_btn.centery - stl.get_height() // 2))
+
+        # Input box (doubles as the search box)
         col = WHITE if self.input_active else GRAY
+        if self.search_mode:
+            col = YELLOW
         pygame.draw.rect(surf, col, self.input_rect, 2)
-        txt_surf = font.render(self.input_text, True, WHITE)
+        if self.search_mode and not self.input_text:
+            txt_surf = self.game.text.render(font, "Search tasks...", DARK_GRAY)
+        else:
+            txt_surf = self.game.text.render(font, self.input_text, WHITE)
         surf.blit(txt_surf, (self.input_rect.x + 8, self.input_rect.y + 6))
 
         # Add button
         pygame.draw.rect(surf, GREEN, self.add_btn, border_radius=4)
-        add_lbl = font.render("Add", True, BG_COLOR)
+        add_lbl = self.game.text.render(font, "Add", BG_COLOR)
         surf.blit(add_lbl, (self.add_btn.centerx - add_lbl.get_width() // 2,
                             self.add_btn.centery - add_lbl.get_height() // 2))
 
+        # Search toggle
+        pygame.draw.rect(surf, YELLOW if self.search_mode else GRAY, self.find_btn,
+                         border_radius=4)
+        find_lbl = self.game.text.render(font, "Find", BG_COLOR)
+        surf.blit(find_lbl, (self.find_btn.centerx - find_lbl.get_width() // 2,
+                             self.find_btn.centery - find_lbl.get_height() // 2))
+
         # Column headers
         hdr_y = self.list_top - 24
-        surf.blit(font.render("Task", True, GRAY), (60, hdr_y))
-        surf.blit(font.render("Pomodoros", True, GRAY), (WIDTH - 380, hdr_y))
-
-        # Task list
+        surf.blit(self.game.text.render(font, "Task", GRAY), (60, hdr_y))
+        surf.blit(self.game.text.render(font, "Pomodoros", GRAY), (WIDTH - 380, hdr_y))
+        sort_lbl = self.game.text.render(self.game.font_small,
+                                         f"Sort: {self.sort_mode}", GRAY)
+        surf.blit(sort_lbl, (self.sort_btn.right - sort_lbl.get_width(),
+                             self.sort_btn.centery - sort_lbl.get_height() // 2))
+
+        # Task list: only the rows intersecting the viewport are touched
+        tasks = self._visible_tasks()
+        scroll = int(self.scroll_px)
+        first, offset = divmod(scroll, self.row_h)
         vis = self._visible_rows()
-        for i in range(vis):
-            idx = i + self.scroll_offset
-            if idx >= len(self.game.tasks):
-                break
-            task = self.game.tasks[idx]
-            row_y = self.list_top + i * self.row_h
-
-            # Separator line
-            pygame.draw.line(surf, DARK_GRAY, (50, row_y), (WIDTH - 50, row_y))
-
-            # Name
-            name_s = font.render(task.name, True, WHITE)
-            surf.blit(name_s, (60, row_y + 10))
-
-            # Pomodoro count
-            count_s = font.render(str(task.pomodoros), True, YELLOW)
-            surf.blit(count_s, (WIDTH - 360, row_y + 10))
-
-            # Start button
-            start_r = pygame.Rect(WIDTH - 220, row_y + 4, 80, 32)
-            pygame.draw.rect(surf, GREEN, start_r, border_radius=4)
-            sl = font.render("Start", True, BG_COLOR)
-            surf.blit(sl, (start_r.centerx - sl.get_width() // 2,
-                           start_r.centery - sl.get_height() // 2))
-
-            # Delete button
-            del_r = pygame.Rect(WIDTH - 130, row_y + 4, 80, 32)
-            pygame.draw.rect(surf, RED, del_r, border_radius=4)
-            dl = font.render("Delete", True, BG_COLOR)
-            surf.blit(dl, (del_r.centerx - dl.get_width() // 2,
-                           del_r.centery - dl.get_height() // 2))
+        prev_clip = surf.get_clip()
+        surf.set_clip(prev_clip.clip(self.list_rect))
+        y = self.list_top - offset
+        for task in tasks[first:first + vis + 1]:
+            surf.blit(self._row_surface(task), (self.list_rect.x, y))
+            y += self.row_h
+        surf.set_clip(prev_clip)
 
         # Scroll hint
-        if len(self.game.tasks) > vis:
-            hint = self.game.font_small.render(
-                f"(scroll: {self.scroll_offset + 1}-"
-                f"{min(self.scroll_offset + vis, len(self.game.tasks))}"
-                f" / {len(self.game.tasks)})", True, DARK_GRAY)
-            surf.blit(hint, (WIDTH // 2 - hint.get_width() // 2, HEIGHT - 30))
+        searching = self.search_mode and self.input_text.strip()
+        if len(tasks) > vis or searching:
+            hint = f"(scroll: {first + 1}-{min(first + vis, len(tasks))} / {len(tasks)})"
+            if searching:
+                hint = f"{len(tasks)} of {len(self.game.tasks)} tasks match"
+            hint_s = self.game.text.render(self.game.font_small, hint, DARK_GRAY)
+            surf.blit(hint_s, (WIDTH // 2 - hint_s.get_width() // 2, HEIGHT - 30))
 
 
 class TalentScene:
+    static = True
+
     def __init__(self, game):
         self.game = game
         self.back_btn = pygame.Rect(WIDTH // 2 - 60, HEIGHT - 55, 120, 36)
@@ -634,6 +2025,7 @@ class TalentScene:
 
     def handle_event(self, ev):
         if ev.type == pygame.MOUSEBUTTONDOWN:
+            self.game.invalidate()
             mx, my = ev.pos
             if self.back_btn.collidepoint(mx, my):
                 self.game.audio.play("ui_click", self.game.sfx_volume)
@@ -643,7 +2035,10 @@ class TalentScene:
                 if btn.collidepoint(mx, my):
                     self.game.audio.play("ui_click", self.game.sfx_volume)
                     tid = TALENT_ORDER[i]
-                    self.game.talents.upgrade(tid)
+                    talents = self.game.talents
+                    if talents.upgrade(tid):
+                        self.game.store.talent_upgraded(tid, talents.levels[tid],
+                                                        talents.fragments)
 
     def update(self, dt):
         pass
@@ -653,11 +2048,11 @@ class TalentScene:
         talents = self.game.talents
 
         # Title
-        title = self.game.font_title.render("TALENTS", True, ORANGE)
+        title = self.game.text.render(self.game.font_title, "TALENTS", ORANGE)
         surf.blit(title, (WIDTH // 2 - title.get_width() // 2, 12))
 
         # Fragment count
-        frag_s = font.render(f"Fragments: {talents.fragments}", True, YELLOW)
+        frag_s = self.game.text.render(font, f"Fragments: {talents.fragments}", YELLOW)
         surf.blit(frag_s, (WIDTH // 2 - frag_s.get_width() // 2, 60))
 
         # Talent rows
@@ -672,11 +2067,11 @@ class TalentScene:
             pygame.draw.line(surf, DARK_GRAY, (40, y), (WIDTH - 40, y))
 
             # Name and level
-            name_s = font.render(f"{d['name']}  Lv {lvl}/{d['max']}", True, WHITE)
+            name_s = self.game.text.render(font, f"{d['name']}  Lv {lvl}/{d['max']}", WHITE)
             surf.blit(name_s, (60, y + 8))
 
             # Description
-            desc_s = font.render(d["desc"], True, GRAY)
+            desc_s = self.game.text.render(font, d["desc"], GRAY)
             surf.blit(desc_s, (60, y + 32))
 
             # Level pips
@@ -689,19 +2084,19 @@ class TalentScene:
             btn = self.upgrade_btns[i]
             if lvl >= d["max"]:
                 pygame.draw.rect(surf, DARK_GRAY, btn, border_radius=4)
-                bl = font.render("MAXED", True, GRAY)
+                bl = self.game.text.render(font, "MAXED", GRAY)
             elif talents.can_upgrade(tid):
                 pygame.draw.rect(surf, GREEN, btn, border_radius=4)
-                bl = font.render(f"{talents.cost(tid)} frags", True, BG_COLOR)
+                bl = self.game.text.render(font, f"{talents.cost(tid)} frags", BG_COLOR)
             else:
                 pygame.draw.rect(surf, DARK_GRAY, btn, border_radius=4)
-                bl = font.render(f"{talents.cost(tid)} frags", True, GRAY)
+                bl = self.game.text.render(font, f"{talents.cost(tid)} frags", GRAY)
             surf.blit(bl, (btn.centerx - bl.get_width() // 2,
                            btn.centery - bl.get_height() // 2))
 
         # Back button
         pygame.draw.rect(surf, RED, self.back_btn, border_radius=4)
-        bl = font.render("Back", True, WHITE)
+        bl = self.game.text.render(font, "Back", WHITE)
         surf.blit(bl, (self.back_btn.centerx - bl.get_width() // 2,
                         self.back_btn.centery - bl.get_height() // 2))
 
@@ -712,6 +2107,7 @@ class SettingsScene:
     SLIDER_W = 260
     SLIDER_H = 8
     KNOB_R = 10
+    static = True
 
     def __init__(self, game):
         self.game = game
@@ -742,8 +2138,14 @@ class SettingsScene:
     def _slider_value_from_x(self, mx):
         return clamp((mx - self.slider_x) / self.SLIDER_W, 0.0, 1.0)
 
+    def _slider_row_rect(self, y):
+        """Screen area covered by a slider row (track, knob and percentage)."""
+        return pygame.Rect(self.slider_x - self.KNOB_R - 2, y - 16,
+                           self.SLIDER_W + self.KNOB_R + 80, 32)
+
     def handle_event(self, ev):
         if ev.type == pygame.MOUSEBUTTONDOWN:
+            self.game.invalidate()
             mx, my = ev.pos
             if self.back_btn.collidepoint(mx, my):
                 self.game.audio.play("ui_click", self.game.sfx_volume)
@@ -771,6 +2173,10 @@ class SettingsScene:
                 self._cycle_option("break", 1)
 
         elif ev.type == pygame.MOUSEBUTTONUP:
+            if self.dragging:
+                # Persist once per drag, not on every motion event
+                self.game.store.set_meta(sfx_volume=self.game.sfx_volume,
+                                         ambient_volume=self.game.ambient_volume)
             self.dragging = None
 
         elif ev.type == pygame.MOUSEMOTION and self.dragging:
@@ -778,9 +2184,12 @@ class SettingsScene:
             val = self._slider_value_from_x(mx)
             if self.dragging == "sfx":
                 self.game.sfx_volume = val
+                self.game.audio.set_sfx_volume(val)
+                self.game.invalidate(self._slider_row_rect(self.row_y[0]))
             elif self.dragging == "ambient":
                 self.game.ambient_volume = val
                 self.game.audio.set_ambient_volume(val)
+                self.game.invalidate(self._slider_row_rect(self.row_y[1]))
 
     def _cycle_option(self, which, direction):
         if which == "pomodoro":
@@ -788,18 +2197,20 @@ class SettingsScene:
             idx = opts.index(self.game.pomodoro_minutes) if self.game.pomodoro_minutes in opts else 0
             idx = (idx + direction) % len(opts)
             self.game.pomodoro_minutes = opts[idx]
+            self.game.store.set_meta(pomodoro_minutes=opts[idx])
         else:
             opts = self.game._break_options
             idx = opts.index(self.game.break_minutes) if self.game.break_minutes in opts else 0
             idx = (idx + direction) % len(opts)
             self.game.break_minutes = opts[idx]
+            self.game.store.set_meta(break_minutes=opts[idx])
 
     def update(self, dt):
         pass
 
     def _draw_slider(self, surf, x, y, value, label, font):
         # Label
-        lbl = font.render(label, True, WHITE)
+        lbl = self.game.text.render(font, label, WHITE)
         surf.blit(lbl, (self.label_x, y - lbl.get_height() // 2))
 
         # Track background
@@ -817,28 +2228,28 @@ class SettingsScene:
         pygame.draw.circle(surf, WHITE, (knob_x, y), self.KNOB_R)
 
         # Percentage
-        pct = font.render(f"{int(value * 100)}%", True, GRAY)
+        pct = self.game.text.render(font, f"{int(value * 100)}%", GRAY)
         surf.blit(pct, (x + self.SLIDER_W + 16, y - pct.get_height() // 2))
 
     def _draw_selector(self, surf, y, value_str, left_btn, right_btn, label, font):
         # Label
-        lbl = font.render(label, True, WHITE)
+        lbl = self.game.text.render(font, label, WHITE)
         surf.blit(lbl, (self.label_x, y - lbl.get_height() // 2))
 
         # Left arrow
         pygame.draw.rect(surf, DARK_GRAY, left_btn, border_radius=4)
-        al = font.render("<", True, WHITE)
+        al = self.game.text.render(font, "<", WHITE)
         surf.blit(al, (left_btn.centerx - al.get_width() // 2,
                         left_btn.centery - al.get_height() // 2))
 
         # Value
-        val_s = font.render(value_str, True, CYAN)
+        val_s = self.game.text.render(font, value_str, CYAN)
         cx = (left_btn.right + right_btn.left) // 2
         surf.blit(val_s, (cx - val_s.get_width() // 2, y - val_s.get_height() // 2))
 
         # Right arrow
         pygame.draw.rect(surf, DARK_GRAY, right_btn, border_radius=4)
-        ar = font.render(">", True, WHITE)
+        ar = self.game.text.render(font, ">", WHITE)
         surf.blit(ar, (right_btn.centerx - ar.get_width() // 2,
                         right_btn.centery - ar.get_height() // 2))
 
@@ -846,7 +2257,7 @@ class SettingsScene:
         font = self.game.font
 
         # Title
-        title = self.game.font_title.render("SETTINGS", True, WHITE)
+        title = self.game.text.render(self.game.font_title, "SETTINGS", WHITE)
         surf.blit(title, (WIDTH // 2 - title.get_width() // 2, 50))
 
         # Sliders
@@ -865,184 +2276,260 @@ class SettingsScene:
 
         # Back button
         pygame.draw.rect(surf, RED, self.back_btn, border_radius=4)
-        bl = font.render("Back", True, WHITE)
+        bl = self.game.text.render(font, "Back", WHITE)
         surf.blit(bl, (self.back_btn.centerx - bl.get_width() // 2,
                         self.back_btn.centery - bl.get_height() // 2))
 
 
-class MissionScene:
-    def __init__(self, game, task):
+class StatsScene:
+    """Mission history: totals, last 7 days, this week per task, best builds."""
+
+    static = True
+    WEEKDAYS = ("Mo", "Tu", "We", "Th", "Fr", "Sa", "Su")
+
+    def __init__(self, game):
         self.game = game
-        self.task = task
-        self.remaining = game.pomodoro_minutes * 60  # seconds
-        self.collected = 0
+        self.back_btn = pygame.Rect(WIDTH // 2 - 60, HEIGHT - 55, 120, 36)
+        # Queried once: the history cannot change while this scene is shown
+        store = game.store
+        self.summary = store.history_summary()
+        self.per_day = store.pomodoros_per_day(7)
+        self.per_task = store.pomodoros_per_task_per_week(1)[:6]
+        self.builds = store.fragments_per_minute_by_build(4)
 
-        cx, cy = WIDTH // 2, HEIGHT // 2 + 30
-        self.cx, self.cy = cx, cy
+    def handle_event(self, ev):
+        if ev.type == pygame.MOUSEBUTTONDOWN:
+            if self.back_btn.collidepoint(ev.pos):
+                self.game.audio.play("ui_click", self.game.sfx_volume)
+                self.game.scene = self.game.menu
 
-        # Apply talent multipliers
-        t = game.talents
-        eff_orbit_speed = ORBIT_SPEED * t.get_multiplier("orbit_speed")
-        self.eff_magnet_radius = MAGNET_RADIUS * t.get_multiplier("magnet_range")
-        self.eff_magnet_strength = MAGNET_STRENGTH * t.get_multiplier("frag_magnet_str")
-        self.eff_shoot_interval_mult = 1.0 / t.get_multiplier("fire_rate")  # lower = faster
-        self.double_frag_chance = t.get_chance("double_frag")
-        self.bullet_count = BASE_BULLET_COUNT + int(t.get_chance("bullet_count"))
+    def update(self, dt):
+        pass
 
-        self.ship = Ship(cx, cy, eff_orbit_speed)
-        self.asteroid_pts = generate_asteroid_points(cx, cy, 40)
-        self.projectiles: list[Projectile] = []
-        self.fragments: list[Fragment] = []
+    def draw(self, surf):
+        font = self.game.font
+        small = self.game.font_small
+        text = self.game.text
 
-        self._next_shot_time()
+        # Title
+        title = text.render(self.game.font_title, "STATS", CYAN)
+        surf.blit(title, (WIDTH // 2 - title.get_width() // 2, 12))
+
+        # Totals
+        done, aborted, earned, minutes = self.summary
+        summary = text.render(
+            font, f"Pomodoros: {done}   Aborted: {aborted}   "
+                  f"Focus: {int(minutes) // 60}h {int(minutes) % 60:02d}m   "
+                  f"Fragments: {earned}", YELLOW)
+        surf.blit(summary, (WIDTH // 2 - summary.get_width() // 2, 60))
+
+        # Last 7 days (bar chart)
+        surf.blit(text.render(font, "Last 7 days", WHITE), (60, 100))
+        chart_x, chart_bottom, chart_h, bar_w = 60, 290, 150, 36
+        peak = max((n for _, n in self.per_day), default=0) or 1
+        for i, (day, n) in enumerate(self.per_day):
+            x = chart_x + i * (bar_w + 14)
+            h = int(chart_h * n / peak)
+            pygame.draw.rect(surf, DARK_GRAY, (x, chart_bottom - chart_h, bar_w, chart_h), 1)
+            if h:
+                pygame.draw.rect(surf, CYAN, (x, chart_bottom - h, bar_w, h))
+            cnt = text.render(small, str(n), GRAY)
+            surf.blit(cnt, (x + bar_w // 2 - cnt.get_width() // 2, chart_bottom - chart_h - 18))
+            wd = text.render(small, self.WEEKDAYS[(day - 1) % 7], GRAY)
+            surf.blit(wd, (x + bar_w // 2 - wd.get_width() // 2, chart_bottom + 4))
+
+        # This week per task
+        surf.blit(text.render(font, "This week", WHITE), (500, 100))
+        if not self.per_task:
+            surf.blit(text.render(small, "No pomodoros yet", DARK_GRAY), (500, 134))
+        for i, (_, name, n) in enumerate(self.per_task):
+            y = 134 + i * 26
+            surf.blit(text.render(small, name[:28], GRAY), (500, y))
+            cnt = text.render(small, str(n), YELLOW)
+            surf.blit(cnt, (WIDTH - 60 - cnt.get_width(), y))
+
+        # Best builds by fragments per minute
+        surf.blit(text.render(font, "Best builds (fragments/min)", WHITE), (60, 330))
+        hdr = " ".join(f"{TALENT_DEFS[tid]['name'][:2]}" for tid in TALENT_ORDER)
+        surf.blit(text.render(small, hdr, DARK_GRAY), (60, 358))
+        for i, (build, rate, n) in enumerate(self.builds):
+            y = 380 + i * 24
+            surf.blit(text.render(small, "  ".join(build.split(",")), GRAY), (60, y))
+            rs = text.render(small, f"{rate:6.1f}/min   {n} missions", YELLOW)
+            surf.blit(rs, (260, y))
+
+        # Back button
+        pygame.draw.rect(surf, RED, self.back_btn, border_radius=4)
+        bl = text.render(font, "Back", WHITE)
+        surf.blit(bl, (self.back_btn.centerx - bl.get_width() // 2,
+                        self.back_btn.centery - bl.get_height() // 2))
+
+
+class MissionScene:
+    def __init__(self, game, task, seed=None):
+        self.game = game
+        self.task = task
+        self.duration = game.pomodoro_minutes * 60
+        self.remaining = self.duration
+        self.sim = MissionSim(game.talents, self.duration, seed=seed)
+        # Wall-clock anchor, set on the first update (not while fading in)
+        self._start = None
+        self._sim_time = 0.0  # mission time already consumed by the sim
         self.complete = False
+        self._background = None  # baked asteroid + orbit ring, built on first draw
+        self._queue = RenderQueue()
 
         # Abort button
         self.abort_btn = pygame.Rect(WIDTH // 2 - 70, HEIGHT - 50, 140, 36)
 
-    def _next_shot_time(self):
-        lo, hi = SHOOT_INTERVAL_RANGE
-        self.shoot_timer = random.uniform(lo, hi) * self.eff_shoot_interval_mult
-
-    def _fire_one_bullet(self):
-        """Fire a single bullet toward the asteroid with slight spread."""
-        base_angle = math.atan2(self.cy - self.ship.y, self.cx - self.ship.x)
-        spread = random.uniform(-BULLET_SPREAD, BULLET_SPREAD)
-        a = base_angle + spread
-        dist = math.hypot(self.cx - self.ship.x, self.cy - self.ship.y)
-        tx = self.ship.x + math.cos(a) * dist
-        ty = self.ship.y + math.sin(a) * dist
-        self.projectiles.append(Projectile(self.ship.x, self.ship.y, tx, ty))
-
     # -- events --
     def handle_event(self, ev):
         if ev.type == pygame.MOUSEBUTTONDOWN:
             if self.abort_btn.collidepoint(ev.pos):
                 self.game.audio.play("ui_click", self.game.sfx_volume)
-                self.game.scene = AbortScene(self.game, self.task, self.collected, self.remaining)
+                self.game.scene = AbortScene(self.game, self.task,
+                                             self.sim.collected, self.remaining,
+                                             seed=self.sim.seed)
 
     # -- update --
     def update(self, dt):
         if self.complete:
             return
 
-        # Timer
-        self.remaining -= dt
-        if self.remaining <= 0:
+        # Timer is anchored to the monotonic clock, not to summed frame dts
+        now = self.game.now()
+        if self._start is None:
+            self._start = now
+        elapsed = min(now - self._start, self.duration)
+        self.remaining = self.duration - elapsed
+
+        sim = self.sim
+        prof = sim.profiler = self.game.profiler
+        if prof:
+            prof.count("fragments", len(sim.fragments))
+            prof.count("projectiles", len(sim.projectiles))
+
+        # Catch the sim up in fixed ticks, at most MAX_CATCHUP_STEPS per frame.
+        # While the window is hidden nothing is stepped: the skipped span is
+        # resolved analytically (MissionSim.skip) once it exceeds the backlog
+        # window or the mission ends.
+        if self.game.hidden:
+            steps = 0
+        else:
+            steps = min(int((elapsed - self._sim_time) / SIM_DT), MAX_CATCHUP_STEPS)
+        seen = (sim.shots, sim.hits, sim.collected)
+        for _ in range(steps):
+            sim.step(SIM_DT)
+        self._sim_time += steps * SIM_DT
+        if steps:
+            self._play_sfx(seen)
+
+        # Lag beyond the backlog window (or past the deadline) is skipped
+        lag = elapsed - self._sim_time
+        if elapsed >= self.duration:
+            sim.skip(lag)
+            self._sim_time = elapsed
+        elif lag > MAX_SIM_BACKLOG:
+            sim.skip(lag - MAX_SIM_BACKLOG)
+            self._sim_time = elapsed - MAX_SIM_BACKLOG
+
+        if elapsed >= self.duration or sim.complete:
             self.remaining = 0
+            self.complete = True
             self.task.pomodoros += 1
             self.game.total_pomodoros += 1
-            self.complete = True
             # Award fragments on completion
-            self.game.talents.fragments += self.collected
+            self.game.talents.fragments += sim.collected
+            self.game.store.mission_complete(self.task, self.game.talents.fragments,
+                                             self.game.total_pomodoros)
+            self.game.store.record_mission(self.task, self.duration, sim.collected,
+                                           sim.collected, False,
+                                           self.game.talents.levels, sim.seed)
+            self.game.task_index.update(self.task)
             # Store mission result for BreakScene
-            self.game._last_mission = {"task": self.task.name, "fragments": self.collected}
+            self.game._last_mission = {"task": self.task.name, "fragments": sim.collected,
+                                       "seed": sim.seed}
             # Brief delay then transition to break
             pygame.time.set_timer(pygame.USEREVENT + 1, 1500, loops=1)
-            return
 
-        # Ship
-        self.ship.update(dt)
-
-        # Shooting state machine
-        self.shoot_timer -= dt
-        if self.shoot_timer <= 0 and self.ship.state == Ship.STATE_ORBITING:
-            self.ship.start_shooting(self.bullet_count)
-            self._next_shot_time()
-
-        # Fire bullets one by one during burst
-        if self.ship.should_fire():
-            self._fire_one_bullet()
-
-        # Projectiles
-        for p in self.projectiles:
-            p.update(dt)
-            # Hit asteroid center?
-            if math.hypot(p.x - self.cx, p.y - self.cy) < 35:
-                p.alive = False
-                # Spawn fragment(s) from asteroid surface
-                spawn_angle = random.uniform(0, 2 * math.pi)
-                spawn_r = 35  # asteroid radius
-                sx = self.cx + math.cos(spawn_angle) * spawn_r
-                sy = self.cy + math.sin(spawn_angle) * spawn_r
-                self.fragments.append(Fragment(sx, sy, self.cx, self.cy))
-                if random.random() < self.double_frag_chance:
-                    spawn_angle2 = random.uniform(0, 2 * math.pi)
-                    sx2 = self.cx + math.cos(spawn_angle2) * spawn_r
-                    sy2 = self.cy + math.sin(spawn_angle2) * spawn_r
-                    self.fragments.append(Fragment(sx2, sy2, self.cx, self.cy))
-
-        self.projectiles = [p for p in self.projectiles if p.alive]
-
-        # Fragments
-        for f in self.fragments:
-            if f.update(dt, self.ship, self.eff_magnet_radius, self.eff_magnet_strength):
-                self.collected += 1
-        self.fragments = [f for f in self.fragments if f.alive]
+    def _play_sfx(self, seen):
+        """One sound per event type that happened in this frame's ticks."""
+        sim, audio = self.sim, self.game.audio
+        if sim.shots > seen[0]:
+            audio.play_sfx("ship_shoot")
+        if sim.hits > seen[1]:
+            audio.play_sfx("asteroid_hit")
+        if sim.collected > seen[2]:
+            audio.play_sfx("fragment_collect")
 
     # -- draw --
     def draw(self, surf):
         font = self.game.font
+        sim = self.sim
+        sprites = self.game.sprites
+        queue = self._queue
+
+        # Asteroid and orbit ring (static background layer)
+        if self._background is None:
+            self._background = sprites.mission_background(sim)
+        queue.add(LAYER_BACKGROUND, *self._background)
 
         # Timer
         mins = int(self.remaining) // 60
         secs = int(self.remaining) % 60
         timer_str = f"{mins:02d}:{secs:02d}"
-        timer_surf = self.game.font_timer.render(timer_str, True, WHITE)
-        surf.blit(timer_surf, (WIDTH // 2 - timer_surf.get_width() // 2, 10))
+        timer_surf = self.game.text.render(self.game.font_timer, timer_str, WHITE)
+        queue.add(LAYER_HUD, timer_surf, (WIDTH // 2 - timer_surf.get_width() // 2, 10))
 
         # Task name
-        task_surf = font.render(self.task.name, True, GRAY)
-        surf.blit(task_surf, (WIDTH // 2 - task_surf.get_width() // 2, 55))
+        task_surf = self.game.text.render(font, self.task.name, GRAY)
+        queue.add(LAYER_HUD, task_surf, (WIDTH // 2 - task_surf.get_width() // 2, 55))
 
         # Collected counter
-        res_surf = font.render(f"Fragments: {self.collected}", True, YELLOW)
-        surf.blit(res_surf, (20, 20))
+        res_surf = self.game.text.render(font, f"Fragments: {sim.collected}", YELLOW)
+        queue.add(LAYER_HUD, res_surf, (20, 20))
 
-        # Asteroid
-        pygame.draw.polygon(surf, ASTEROID_COLOR, self.asteroid_pts)
-        pygame.draw.polygon(surf, GRAY, self.asteroid_pts, 2)
+        # Entities
+        sim.ship.enqueue(queue, sprites)
+        sim.projectiles.enqueue(queue, sprites)
+        sim.fragments.enqueue(queue, sprites)
 
-        # Ship
-        self.ship.draw(surf)
+        # Abort button (the rect is drawn now; the background never overlaps it)
+        pygame.draw.rect(surf, RED, self.abort_btn, border_radius=4)
+        al = self.game.text.render(font, "Abort Mission", WHITE)
+        queue.add(LAYER_HUD, al, (self.abort_btn.centerx - al.get_width() // 2,
+                                  self.abort_btn.centery - al.get_height() // 2))
 
-        # Projectiles
-        for p in self.projectiles:
-            p.draw(surf)
+        queue.flush(surf)
 
-        # Fragments
-        for f in self.fragments:
-            f.draw(surf)
-
-        # Orbit ring (subtle)
-        pygame.draw.circle(surf, (30, 30, 40), (self.cx, self.cy),
-                           ORBIT_RADIUS, 1)
-
-        # Abort button
-        pygame.draw.rect(surf, RED, self.abort_btn, border_radius=4)
-        al = font.render("Abort Mission", True, WHITE)
-        surf.blit(al, (self.abort_btn.centerx - al.get_width() // 2,
-                        self.abort_btn.centery - al.get_height() // 2))
+        # Tractor beam to the nearest fragment in magnet reach
+        if not self.complete:
+            frags, ship = sim.fragments, sim.ship
+            i = frags.nearest
+            if 0 <= i < len(frags):
+                pos = frags.pos[i]
+                pygame.draw.aaline(surf, BEAM_COLOR, (ship.x, ship.y),
+                                   (pos.real, pos.imag))
 
         # Completion overlay
         if self.complete:
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 120))
-            surf.blit(overlay, (0, 0))
-            done = self.game.font_heading.render("MISSION COMPLETE!", True, GREEN)
+            surf.blit(self.game.overlays.get(120), (0, 0))
+            done = self.game.text.render(self.game.font_heading, "MISSION COMPLETE!", GREEN)
             surf.blit(done, (WIDTH // 2 - done.get_width() // 2,
                              HEIGHT // 2 - 30))
-            earned = font.render(f"+{self.collected} fragments earned!", True, YELLOW)
+            earned = self.game.text.render(font, f"+{sim.collected} fragments earned!", YELLOW)
             surf.blit(earned, (WIDTH // 2 - earned.get_width() // 2,
                                HEIGHT // 2 + 15))
 
 
 class AbortScene:
     PENALTY = 0.30  # keep 30% of collected fragments
+    static = True
 
-    def __init__(self, game, task, collected, time_remaining):
+    def __init__(self, game, task, collected, time_remaining, seed=None):
         self.game = game
         self.task = task
+        self.seed = seed  # mission RNG seed, for replaying the aborted run
         self.collected = collected
         self.earned = int(collected * self.PENALTY)
         self.time_remaining = time_remaining
@@ -1050,6 +2537,10 @@ class AbortScene:
 
         # Award the 30% immediately
         self.game.talents.fragments += self.earned
+        self.game.store.set_meta(fragments=self.game.talents.fragments)
+        self.game.store.record_mission(task, self.time_elapsed, collected, self.earned,
+                                       True, self.game.talents.levels, seed)
+        self.game.task_index.update(task)
 
         # Button
         self.continue_btn = pygame.Rect(WIDTH // 2 - 80, HEIGHT // 2 + 120, 160, 40)
@@ -1069,16 +2560,14 @@ class AbortScene:
         font = self.game.font
 
         # Overlay background
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        surf.blit(overlay, (0, 0))
+        surf.blit(self.game.overlays.get(180), (0, 0))
 
         # Title
-        title = self.game.font_heading.render("MISSION ABORTED", True, RED)
+        title = self.game.text.render(self.game.font_heading, "MISSION ABORTED", RED)
         surf.blit(title, (WIDTH // 2 - title.get_width() // 2, HEIGHT // 2 - 140))
 
         # Task name
-        name_s = font.render(f"Task: {self.task.name}", True, GRAY)
+        name_s = self.game.text.render(font, f"Task: {self.task.name}", GRAY)
         surf.blit(name_s, (WIDTH // 2 - name_s.get_width() // 2, HEIGHT // 2 - 80))
 
         # Time elapsed
@@ -1086,41 +2575,43 @@ class AbortScene:
         secs_e = int(self.time_elapsed) % 60
         mins_r = int(self.time_remaining) // 60
         secs_r = int(self.time_remaining) % 60
-        time_s = font.render(
+        time_s = self.game.text.render(
+            font,
             f"Time: {mins_e:02d}:{secs_e:02d} elapsed  /  {mins_r:02d}:{secs_r:02d} remaining",
-            True, WHITE)
+            WHITE)
         surf.blit(time_s, (WIDTH // 2 - time_s.get_width() // 2, HEIGHT // 2 - 45))
 
         # Fragments collected
-        coll_s = font.render(f"Fragments mined: {self.collected}", True, YELLOW)
+        coll_s = self.game.text.render(font, f"Fragments mined: {self.collected}", YELLOW)
         surf.blit(coll_s, (WIDTH // 2 - coll_s.get_width() // 2, HEIGHT // 2 - 10))
 
         # Penalty
-        pen_s = font.render(f"Abort penalty: only 30% kept", True, ORANGE)
+        pen_s = self.game.text.render(font, f"Abort penalty: only 30% kept", ORANGE)
         surf.blit(pen_s, (WIDTH // 2 - pen_s.get_width() // 2, HEIGHT // 2 + 25))
 
         # Earned
-        earn_s = self.game.font_heading.render(f"+{self.earned} fragments", True, YELLOW)
+        earn_s = self.game.text.render(self.game.font_heading,
+                                       f"+{self.earned} fragments", YELLOW)
         surf.blit(earn_s, (WIDTH // 2 - earn_s.get_width() // 2, HEIGHT // 2 + 65))
 
         # Continue button
         pygame.draw.rect(surf, GRAY, self.continue_btn, border_radius=4)
-        bl = font.render("Continue", True, BG_COLOR)
+        bl = self.game.text.render(font, "Continue", BG_COLOR)
         surf.blit(bl, (self.continue_btn.centerx - bl.get_width() // 2,
                         self.continue_btn.centery - bl.get_height() // 2))
 
 
 class FadeTransition:
-    """Fade-to-black transition between two scenes."""
+    """Fade-to-black transition between two scenes (blends cached snapshots by default)."""
 
-    def __init__(self, game, old_scene, new_scene, duration=0.5):
+    def __init__(self, game, old_scene, new_scene, duration=0.5, snapshot=True):
         self.game = game
         self.old_scene = old_scene
         self.new_scene = new_scene
         self.duration = duration
         self.timer = 0.0
-        self.overlay = pygame.Surface((WIDTH, HEIGHT))
-        self.overlay.fill((0, 0, 0))
+        self.snapshot = snapshot
+        self._frames = {}  # scene -> rendered snapshot
 
     def handle_event(self, ev):
         pass  # Block input during transition
@@ -1130,19 +2621,37 @@ class FadeTransition:
         if self.timer >= self.duration:
             self.game.scene = self.new_scene
 
+    def _snapshot(self, scene):
+        frame = self._frames.get(scene)
+        if frame is None:
+            frame = pygame.Surface((WIDTH, HEIGHT))
+            if pygame.display.get_surface() is not None:
+                frame = frame.convert()
+            frame.fill(BG_COLOR)
+            scene.draw(frame)
+            self._frames = {scene: frame}  # the old snapshot is no longer needed
+        return frame
+
     def draw(self, surf):
         half = self.duration / 2
         if self.timer < half:
-            # Fade out: draw old scene, overlay goes 0→255
-            self.old_scene.draw(surf)
+            # Fade out: old scene, darkness goes 0→255
+            scene = self.old_scene
             alpha = int(255 * (self.timer / half))
         else:
-            # Fade in: draw new scene, overlay goes 255→0
-            self.new_scene.draw(surf)
+            # Fade in: new scene, darkness goes 255→0
+            scene = self.new_scene
             alpha = int(255 * (1.0 - (self.timer - half) / half))
         alpha = max(0, min(255, alpha))
-        self.overlay.set_alpha(alpha)
-        surf.blit(self.overlay, (0, 0))
+        if self.snapshot:
+            # Blending the snapshot over black == black overlay at ``alpha``
+            frame = self._snapshot(scene)
+            frame.set_alpha(255 - alpha)
+            surf.fill(BG_COLOR)
+            surf.blit(frame, (0, 0))
+        else:
+            scene.draw(surf)
+            surf.blit(self.game.overlays.get(alpha), (0, 0))
 
 
 class StoryScene:
@@ -1150,11 +2659,13 @@ class StoryScene:
         self.game = game
         self.task = task
         self.image = image
-        # Scale image to fit screen while keeping aspect ratio
-        iw, ih = image.get_size()
-        scale = min(WIDTH / iw, HEIGHT / ih)
-        new_w, new_h = int(iw * scale), int(ih * scale)
-        self.scaled = pygame.transform.smoothscale(image, (new_w, new_h))
+        # Scale image to fit screen while keeping aspect ratio (Game.story_image
+        # already hands out screen-size variants, so this is normally a no-op)
+        new_w, new_h = fit_size(*image.get_size())
+        if image.get_size() == (new_w, new_h):
+            self.scaled = image
+        else:
+            self.scaled = pygame.transform.smoothscale(image, (new_w, new_h))
         self.img_x = (WIDTH - new_w) // 2
         self.img_y = (HEIGHT - new_h) // 2
 
@@ -1172,10 +2683,120 @@ class StoryScene:
         surf.fill(BG_COLOR)
         surf.blit(self.scaled, (self.img_x, self.img_y))
         # Hint text
-        hint = self.game.font_small.render("Click or press SPACE to start mission", True, GRAY)
+        hint = self.game.text.render(self.game.font_small,
+                                     "Click or press SPACE to start mission", GRAY)
         surf.blit(hint, (WIDTH // 2 - hint.get_width() // 2, HEIGHT - 30))
 
 
+# ---------------------------------------------------------------------------
+# Profiling (opt-in: POMI_PROFILE=1, F3 toggles, F4 dumps CSV)
+# ---------------------------------------------------------------------------
+PROFILE_WINDOW = 600  # frames kept for the rolling percentiles / CSV dump
+PROFILE_SECTIONS = ("events", "update", "projectiles", "fragments", "draw", "flip")
+PROFILE_COUNTS = ("fragments", "projectiles")
+
+
+class FrameProfiler:
+    """Per-frame timing of the main loop phases and the mission entity loops."""
+
+    def __init__(self, csv_path=None):
+        self.frames: deque[tuple] = deque(maxlen=PROFILE_WINDOW)
+        self.frame_no = 0
+        self._times = dict.fromkeys(PROFILE_SECTIONS, 0.0)
+        self._counts = dict.fromkeys(PROFILE_COUNTS, 0)
+        self._frame_start = self._last = 0.0
+        self._csv_file = None
+        self._csv = None
+        self.last_dump = None  # path of the latest dump_csv, shown in the overlay
+        if csv_path:
+            self._csv_file = open(csv_path, "w", newline="")
+            self._csv = csv.writer(self._csv_file)
+            self._csv.writerow(self._header())
+
+    @staticmethod
+    def _header():
+        return (("frame", "total_ms")
+                + tuple(f"{s}_ms" for s in PROFILE_SECTIONS) + PROFILE_COUNTS)
+
+    # -- recording --
+    def begin_frame(self):
+        for name in self._times:
+            self._times[name] = 0.0
+        self._frame_start = self._last = time.perf_counter()
+
+    def mark(self, section):
+        """Charge the time since the previous mark to ``section``."""
+        now = time.perf_counter()
+        self._times[section] += now - self._last
+        self._last = now
+
+    def add(self, section, seconds):
+        """Charge an explicitly measured span (nested inside a mark)."""
+        self._times[section] += seconds
+
+    def count(self, name, n):
+        self._counts[name] = n
+
+    def end_frame(self):
+        total = time.perf_counter() - self._frame_start
+        row = ((self.frame_no, round(total * 1000, 3))
+               + tuple(round(self._times[s] * 1000, 3) for s in PROFILE_SECTIONS)
+               + tuple(self._counts[c] for c in PROFILE_COUNTS))
+        self.frames.append(row)
+        if self._csv:
+            self._csv.writerow(row)
+        self.frame_no += 1
+
+    # -- reporting --
+    def percentiles(self, column=1, ps=(50, 95, 99)):
+        """Return the given percentiles (ms) of a column over the window."""
+        values = sorted(row[column] for row in self.frames)
+        if not values:
+            return tuple(0.0 for _ in ps)
+        last = len(values) - 1
+        return tuple(values[min(last, int(p / 100 * len(values)))] for p in ps)
+
+    def dump_csv(self, path):
+        """Write the rolling window of per-frame samples to ``path``."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(self._header())
+            writer.writerows(self.frames)
+        self.last_dump = path
+        return path
+
+    def close(self):
+        if self._csv_file:
+            self._csv_file.close()
+            self._csv_file = self._csv = None
+
+    def draw(self, surf, font):
+        """Overlay with frame-time percentiles, phase means and entity counts."""
+        if not self.frames:
+            return
+        p50, p95, p99 = self.percentiles()
+        n = len(self.frames)
+        means = {s: sum(row[2 + i] for row in self.frames) / n
+                 for i, s in enumerate(PROFILE_SECTIONS)}
+        last = self.frames[-1]
+        lines = [
+            f"frame ms  p50 {p50:5.2f}  p95 {p95:5.2f}  p99 {p99:5.2f}",
+            "  ".join(f"{s[:4]} {means[s]:.2f}" for s in PROFILE_SECTIONS),
+            "  ".join(f"{c} {last[2 + len(PROFILE_SECTIONS) + i]}"
+                      for i, c in enumerate(PROFILE_COUNTS)),
+        ]
+        if self.last_dump:
+            lines.append(f"saved {self.last_dump}")
+        line_h = font.get_linesize()
+        box = pygame.Rect(8, HEIGHT - 12 - line_h * len(lines), 0, line_h * len(lines) + 6)
+        rendered = [font.render(line, True, GREEN) for line in lines]
+        box.width = max(s.get_width() for s in rendered) + 12
+        box.y -= 6
+        surf.fill((0, 0, 0), box)
+        for i, s in enumerate(rendered):
+            surf.blit(s, (box.x + 6, box.y + 3 + i * line_h))
+
+
 # ---------------------------------------------------------------------------
 # Game
 # ---------------------------------------------------------------------------
@@ -1192,8 +2813,16 @@ class Game:
         self.font = pygame.font.Font(FONT_MONO, 18)              # Body / UI text
         self.font_small = pygame.font.Font(FONT_MONO, 14)        # Hints, captions
 
-        self.audio = AudioManager()
-        self.tasks: list[Task] = []
+        self.text = TextCache()
+        self.sprites = SpriteCache()
+        self.overlays = OverlayCache()
+        # Private copy for the pulsing banner (cached surfaces are shared)
+        self._ready_surf = self.text.render(self.font, "Ready for mission", GREEN).copy()
+
+        self.assets = AssetManager()
+        self.audio = AudioManager(self.assets)
+        self.tasks = TaskList()
+        self.task_index = TaskIndex()
         self.talents = TalentTree()
         self.total_pomodoros = 0
 
@@ -1205,32 +2834,121 @@ class Game:
         self._pomodoro_options = [1, 5, 15, 25, 30, 45, 60]
         self._break_options = [1, 3, 5, 10]
 
+        # Saved progress and settings
+        self.store = SaveStore()
+        self._apply_saved_state(self.store.load())
+        self.audio.set_sfx_volume(self.sfx_volume)
+
         # Break timer (persistent across menu scenes)
         self.break_active = False
         self.break_remaining = 0.0
+        self._break_deadline = 0.0  # monotonic timestamp when the break ends
         self.break_ready = False
         self.break_ready_timer = 0.0
         self._break_task_name = ""
         self._break_fragments = 0
-        self.story_images = self._load_story_images()
+        # Story images load on demand, one mission ahead (see story_image)
+        self.story_paths = self._story_image_paths()
+        self._story_images: dict[int, pygame.Surface] = {}
+        self._story_jobs: dict[int, AssetJob] = {}
+        self._prefetch_story(self._story_index())
         self.menu = MenuScene(self)
         self.scene = IntroScene(self)
         self.running = True
 
-    def _load_story_images(self):
-        """Load all story_XX.png images sorted by number."""
-        img_dir = os.path.join(os.path.dirname(__file__), "assets", "images")
-        images = []
-        if not os.path.isdir(img_dir):
-            return images
+        # Opt-in frame profiler (POMI_PROFILE=1 or F3; POMI_PROFILE_CSV=path)
+        self.profiler = None
+        if os.environ.get("POMI_PROFILE") or os.environ.get("POMI_PROFILE_CSV"):
+            self.profiler = FrameProfiler(os.environ.get("POMI_PROFILE_CSV"))
+
+        # Frame pacing state (see _target_fps)
+        self.focused = True
+        self.hidden = False
+        self._idle_time = 0.0
+
+        # Dirty-rect rendering for static scenes (see invalidate / _render)
+        self._drawn_scene = None
+        self._full_redraw = True
+        self._dirty_rects: list[pygame.Rect] = []
+        self._banner_key = None
+
+    def _apply_saved_state(self, state):
+        for task_id, name, pomodoros, active in state["tasks"]:
+            task = Task(name)
+            task.id = task_id
+            task.pomodoros = pomodoros
+            task.active = active
+            self.tasks.append(task)
+            self.task_index.add(task)
+        for tid, level in state["talents"].items():
+            if tid in TALENT_DEFS:
+                self.talents.levels[tid] = clamp(level, 0, TALENT_DEFS[tid]["max"])
+        meta = state["meta"]
+        self.talents.fragments = meta.get("fragments", 0)
+        self.total_pomodoros = meta.get("total_pomodoros", 0)
+        for key in SETTING_KEYS:
+            if key in meta:
+                setattr(self, key, meta[key])
+
+    def _story_image_paths(self):
+        """Paths of all story_XX.png images sorted by number."""
+        if not os.path.isdir(_IMAGE_DIR):
+            return []
         files = sorted(
-            f for f in os.listdir(img_dir)
+            f for f in os.listdir(_IMAGE_DIR)
             if f.startswith("story_") and f.endswith(".png")
         )
-        for f in files:
-            path = os.path.join(img_dir, f)
-            images.append(pygame.image.load(path).convert_alpha())
-        return images
+        return [os.path.join(_IMAGE_DIR, f) for f in files]
+
+    def _story_index(self):
+        # Pick image based on total pomodoros completed (0-indexed)
+        return min(self.total_pomodoros, len(self.story_paths) - 1)
+
+    def _prefetch_story(self, idx):
+        if (not 0 <= idx < len(self.story_paths) or idx in self._story_images
+                or idx in self._story_jobs):
+            return
+        self._story_jobs[idx] = self.assets.submit(
+            load_scaled_story, self.story_paths[idx],
+            os.path.join(SAVE_DIR, STORY_CACHE_DIR),
+            on_done=lambda result, i=idx: self._story_loaded(i, result))
+
+    def _story_loaded(self, idx, result):
+        if isinstance(result, pygame.Surface):
+            image = result.convert_alpha()
+        else:
+            # Cached variant: wrap the mapped bytes, copy once into display format
+            buf, offset, size = result
+            view = memoryview(buf)[offset:]
+            image = pygame.image.frombuffer(view, size, "RGBA").convert_alpha()
+            view.release()
+            if mmap is not None and isinstance(buf, mmap.mmap):
+                buf.close()
+        self._story_images[idx] = image
+
+    def story_image(self, idx):
+        """Story image ``idx`` (None if it failed to load); prefetches the next one."""
+        self._prefetch_story(idx)
+        job = self._story_jobs.pop(idx, None)
+        if job is not None:
+            self.assets.wait(job)
+        image = self._story_images.get(idx)
+        for old in [i for i in self._story_images if i not in (idx, idx + 1)]:
+            del self._story_images[old]
+        self._prefetch_story(idx + 1)
+        return image
+
+    def _ambient_kind(self, scene):
+        if isinstance(scene, MissionScene):
+            return "mission"
+        if isinstance(scene, (MenuScene, TalentScene, SettingsScene, StatsScene,
+                              IntroScene)):
+            return "break" if self.break_active else "menu"
+        return None
+
+    def now(self):
+        """Monotonic timestamp (seconds) that mission and break timers anchor to."""
+        return time.monotonic()
 
     def set_scene(self, name):
         if name == "menu":
@@ -1240,6 +2958,7 @@ class Game:
         info = getattr(self, "_last_mission", {"task": "", "fragments": 0})
         self.break_active = True
         self.break_remaining = self.break_minutes * 60
+        self._break_deadline = self.now() + self.break_remaining
         self.break_ready = False
         self.break_ready_timer = 0.0
         self._break_task_name = info["task"]
@@ -1253,18 +2972,32 @@ class Game:
         if self.break_ready:
             self.break_ready_timer += dt
             return
-        self.break_remaining -= dt
+        self.break_remaining = self._break_deadline - self.now()
         if self.break_remaining <= 0:
             self.break_remaining = 0
             self.break_ready = True
             self.break_ready_timer = 0.0
 
+    def invalidate(self, rect=None):
+        """Mark a screen area (or the whole screen) to be redrawn."""
+        if rect is None:
+            self._full_redraw = True
+        else:
+            self._dirty_rects.append(pygame.Rect(rect))
+
+    def _break_banner_key(self):
+        """Value that changes whenever the break banner would look different."""
+        if not self.break_active:
+            return None
+        if self.break_ready:
+            return ("ready", self.break_ready_timer)  # pulsing every frame
+        return ("countdown", int(self.break_remaining))
+
     def draw_break_banner(self, surf):
         """Draw break status bar at the bottom of any menu scene."""
         if not self.break_active:
             return
 
-        BANNER_H = 36
         banner_y = HEIGHT - BANNER_H
         # Background bar
         pygame.draw.rect(surf, (15, 15, 25), (0, banner_y, WIDTH, BANNER_H))
@@ -1275,19 +3008,20 @@ class Game:
             mins = int(self.break_remaining) // 60
             secs = int(self.break_remaining) % 60
             timer_str = f"Break  {mins:02d}:{secs:02d}"
-            timer_surf = self.font_small.render(timer_str, True, GRAY)
+            timer_surf = self.text.render(self.font_small, timer_str, GRAY)
             surf.blit(timer_surf, (WIDTH // 2 - timer_surf.get_width() // 2,
                                     banner_y + BANNER_H // 2 - timer_surf.get_height() // 2))
             # Task info (left side, subtle)
-            info = self.font_small.render(
+            info = self.text.render(
+                self.font_small,
                 f"{self._break_task_name}  ·  +{self._break_fragments} frags",
-                True, DARK_GRAY)
+                DARK_GRAY)
             surf.blit(info, (12, banner_y + BANNER_H // 2 - info.get_height() // 2))
         else:
             # Ready mode - pulsing green text
             t = self.break_ready_timer * 0.8 * 2 * math.pi
             alpha = 100 + int(155 * (0.5 + 0.5 * math.sin(t)))
-            ready_surf = self.font.render("Ready for mission", True, GREEN)
+            ready_surf = self._ready_surf
             ready_surf.set_alpha(alpha)
             surf.blit(ready_surf, (WIDTH // 2 - ready_surf.get_width() // 2,
                                     banner_y + BANNER_H // 2 - ready_surf.get_height() // 2))
@@ -1297,47 +3031,148 @@ class Game:
         self.break_active = False
         self.break_ready = False
 
-    def start_mission(self, task_idx):
+    def start_mission(self, task):
         self.dismiss_break()
-        task = self.tasks[task_idx]
-        if self.story_images:
-            # Pick image based on total pomodoros completed (0-indexed)
-            idx = min(self.total_pomodoros, len(self.story_images) - 1)
-            new_scene = StoryScene(self, task, self.story_images[idx])
+        image = self.story_image(self._story_index()) if self.story_paths else None
+        if image is not None:
+            new_scene = StoryScene(self, task, image)
         else:
             new_scene = MissionScene(self, task)
         self.scene = FadeTransition(self, self.scene, new_scene)
 
+    def _handle_window_event(self, ev):
+        """Track focus/visibility for frame pacing. Returns True if consumed."""
+        if ev.type == pygame.WINDOWFOCUSGAINED:
+            self.focused = True
+        elif ev.type == pygame.WINDOWFOCUSLOST:
+            self.focused = False
+        elif ev.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+            self.hidden = True
+        elif ev.type in (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN,
+                         pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+            self.hidden = False
+            self.invalidate()
+        else:
+            return False
+        self._idle_time = 0.0
+        return True
+
+    def _target_fps(self):
+        """Tick rate for the next frame (lower when hidden, unfocused or idle)."""
+        if self.hidden:
+            return HIDDEN_FPS
+        if not self.focused:
+            return UNFOCUSED_FPS
+        if getattr(self.scene, "static", False) and self._idle_time >= IDLE_AFTER:
+            return IDLE_FPS
+        return FPS
+
+    def _render(self):
+        """Draw the current scene, skipping or clipping work for static scenes."""
+        scene = self.scene
+        menu_scene = isinstance(scene, (MenuScene, TalentScene, SettingsScene, StatsScene))
+        if menu_scene:
+            key = self._break_banner_key()
+            if key != self._banner_key:
+                self._banner_key = key
+                self.invalidate((0, HEIGHT - BANNER_H, WIDTH, BANNER_H))
+
+        prof = self.profiler
+        if (scene is not self._drawn_scene or self._full_redraw or prof
+                or not getattr(scene, "static", False)):
+            areas = [None]
+        elif self._dirty_rects:
+            areas = _merge_overlapping(self._dirty_rects)
+        else:
+            return  # nothing changed since the last frame
+        self._drawn_scene = scene
+        self._full_redraw = False
+        self._dirty_rects.clear()
+
+        # Each dirty area is redrawn on its own, clipped, so distant areas
+        # (input box, banner countdown) don't pull in the screen between them
+        for area in areas:
+            self.screen.set_clip(area)
+            self.screen.fill(BG_COLOR)
+            scene.draw(self.screen)
+            # Break banner on top of menu scenes
+            if menu_scene:
+                self.draw_break_banner(self.screen)
+            if prof:
+                prof.draw(self.screen, self.font_small)
+                prof.mark("draw")
+        self.screen.set_clip(None)
+        if areas[0] is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(areas)
+
+    def _handle_profiler_key(self, ev):
+        """F3 toggles the profiler overlay, F4 dumps its window to CSV."""
+        if ev.key == pygame.K_F3:
+            if self.profiler:
+                self.profiler.close()
+                self.profiler = None
+                self.invalidate()
+            else:
+                self.profiler = FrameProfiler()
+            return True
+        if ev.key == pygame.K_F4 and self.profiler:
+            self.profiler.dump_csv(f"profile_{int(time.time())}.csv")
+            return True
+        return False
+
     async def run(self):
         while self.running:
-            dt = self.clock.tick(FPS) / 1000.0
+            dt = self.clock.tick(self._target_fps()) / 1000.0
+            self._idle_time += dt
+            prof = self.profiler
+            if prof:
+                prof.begin_frame()
 
             for ev in pygame.event.get():
                 if ev.type == pygame.QUIT:
                     self.running = False
+                elif self._handle_window_event(ev):
+                    pass
+                elif ev.type == pygame.KEYDOWN and self._handle_profiler_key(ev):
+                    pass
                 elif ev.type == pygame.USEREVENT + 1:
                     # Mission complete -> break
                     self._start_break()
                 else:
+                    if ev.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION,
+                                   pygame.MOUSEWHEEL, pygame.KEYDOWN):
+                        self._idle_time = 0.0  # input: back to full rate
                     self.scene.handle_event(ev)
 
+            if prof:
+                prof.mark("events")
+
+            self.assets.poll()
             self.update_break(dt)
             self.scene.update(dt)
 
-            # Ambient audio: play in menu scenes, stop in gameplay
-            if isinstance(self.scene, (MenuScene, TalentScene, SettingsScene, IntroScene)):
-                self.audio.play_ambient("ambient_menu", self.ambient_volume)
-            else:
-                self.audio.stop_ambient()
-
-            self.screen.fill(BG_COLOR)
-            self.scene.draw(self.screen)
-            # Break banner on top of menu scenes
-            if isinstance(self.scene, (MenuScene, TalentScene, SettingsScene)):
-                self.draw_break_banner(self.screen)
-            pygame.display.flip()
+            # Ambient playlist follows the scene; a fade crossfades it
+            # in step with the picture
+            scene, fade = self.scene, 0.0
+            if isinstance(scene, FadeTransition):
+                scene, fade = scene.new_scene, scene.duration
+            self.audio.set_ambient(self._ambient_kind(scene), self.ambient_volume, fade)
+            self.audio.update(dt)
+
+            if prof:
+                prof.mark("update")
+            self._render()
+            if prof:
+                prof.mark("flip")
+                prof.end_frame()
             await asyncio.sleep(0)
 
+        if self.profiler:
+            self.profiler.close()
+        self.store.close()
+        self.assets.shutdown()
         pygame.quit()
 
 
@@ -1345,4 +3180,7 @@ class Game:
 # Entry point
 # ---------------------------------------------------------------------------
 if __name__ == "__main__":
-    asyncio.run(Game().run())
+    if "--simulate" in sys.argv:
+        _simulate_cli(sys.argv[sys.argv.index("--simulate") + 1:])
+    else:
+        asyncio.run(Game().run())
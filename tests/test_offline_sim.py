@@ -0,0 +1,80 @@
+"""The analytic offline resolver (MissionSim.skip) against the ticked simulation."""
+
+import os
+import statistics
+import sys
+import tempfile
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ["POMI_SAVE_DIR"] = tempfile.mkdtemp(prefix="pomi-test-")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+SEEDS = range(20)
+MINUTES = 5
+TOLERANCE = 0.05  # mean collected may differ from the ticked sim by 5%
+LEVELS = {
+    "none": None,
+    "talents": {"fire_rate": 5, "double_frag": 5, "bullet_count": 2, "magnet_range": 3},
+}
+
+
+def _hidden_mission(game, levels, seed, frame=1 / main.HIDDEN_FPS):
+    """Run a MissionScene with the window hidden, on a fake clock."""
+    game.talents.levels.update(levels or {})
+    game.pomodoro_minutes = MINUTES
+    clock = [0.0]
+    game.now = lambda: clock[0]
+    game.hidden = True
+    task = main.Task("hidden")
+    game.store.add_task(task)
+    game.task_index.add(task)
+    scene = main.MissionScene(game, task, seed=seed)
+    while not scene.complete:
+        clock[0] += frame
+        scene.update(frame)
+    return scene.sim.collected
+
+
+@pytest.fixture(scope="module")
+def game():
+    game = main.Game()
+    yield game
+    game.store.close()
+    game.assets.shutdown()
+
+
+@pytest.fixture(scope="module", params=list(LEVELS), ids=list(LEVELS))
+def ticked(request):
+    levels = LEVELS[request.param]
+    runs = [main.simulate_mission(levels, MINUTES, seed=s) for s in SEEDS]
+    return levels, statistics.fmean(r["collected"] for r in runs)
+
+
+def _assert_close(mean, expected):
+    assert abs(mean - expected) <= TOLERANCE * expected, (mean, expected)
+
+
+def test_offline_matches_ticked(ticked):
+    levels, expected = ticked
+    runs = [main.simulate_mission(levels, MINUTES, seed=s, offline=True) for s in SEEDS]
+    _assert_close(statistics.fmean(r["collected"] for r in runs), expected)
+
+
+def test_hidden_scene_matches_ticked(game, ticked):
+    levels, expected = ticked
+    game.talents.levels = dict.fromkeys(game.talents.levels, 0)
+    collected = [_hidden_mission(game, levels, s) for s in SEEDS]
+    _assert_close(statistics.fmean(collected), expected)
+
+
+def test_offline_spawns_per_bullet():
+    result = main.simulate_mission(minutes=MINUTES, seed=2, offline=True)
+    assert result["spawned"] == result["shots"]  # no double_frag talent
+    talented = main.simulate_mission(LEVELS["talents"], MINUTES, seed=2, offline=True)
+    assert talented["shots"] <= talented["spawned"] <= 2 * talented["shots"]